@@ -5,11 +5,13 @@ import datetime
 from datetime import datetime
 
 import discord
-import requests
 from discord.ext import commands
 from pytz import timezone
 from dotenv import dotenv_values
 
+from utils import http_client
+from utils.name_resolver import resolver
+
 # Bot Setup
 BASEDIR = os.path.abspath(os.path.dirname(__file__))
 ENV_POS = os.path.join(BASEDIR, '../.env')
@@ -22,6 +24,8 @@ config = {
 TIMEZONE = timezone(config["BOT_TIMEZONE"])
 API_KEY = config["HYPIXEL_API_KEY"]
 
+HYPIXEL_BASE_URL = "https://api.hypixel.net"
+
 #levelcalc vars
 easylevels = 4
 easylevelxp = 7000
@@ -89,13 +93,12 @@ class HypixelModule(commands.Cog):
             return
 
         try:
-            uuidget = requests.get(f"https://api.minetools.eu/uuid/{username}").json()
-            uuid = uuidget["id"]
-            statusdata = requests.get(f"https://api.hypixel.net/status?key={API_KEY}&uuid={uuid}").json()
+            uuid, name = await resolver.resolve(username)
+            statusdata = (await http_client.get_json(f"{HYPIXEL_BASE_URL}/status", params={"key": API_KEY, "uuid": uuid})).data
             if not statusdata["success"] and statusdata["cause"] == "Invalid API key":
                 return
 
-            embed = discord.Embed(title=f"Hypixel Player Status - {uuidget['name']}",color=0x6edd67)
+            embed = discord.Embed(title=f"Hypixel Player Status - {name}",color=0x6edd67)
 
             session = statusdata["session"]
 
@@ -116,13 +119,13 @@ class HypixelModule(commands.Cog):
                 embed.add_field(name="Status",value=status,inline=True)
 
                 try:
-                    playerdata = requests.get(f"https://api.hypixel.net/player?key={API_KEY}&uuid={uuid}").json()
+                    playerdata = (await http_client.get_json(f"{HYPIXEL_BASE_URL}/player", params={"key": API_KEY, "uuid": uuid})).data
                     lastonline = playerdata["player"]["lastLogin"]
                     lastjoin = datetime.fromtimestamp(lastonline / 1e3)
                     locallastjoin = lastjoin.astimezone(TIMEZONE).strftime("%d %B %Y - %I:%M:%S %p")
                     embed.add_field(name="Last Seen",value=locallastjoin,inline=True)
 
-                    pastdata = requests.get(f"https://api.hypixel.net/recentGames?key={API_KEY}&uuid={uuid}").json()
+                    pastdata = (await http_client.get_json(f"{HYPIXEL_BASE_URL}/recentGames", params={"key": API_KEY, "uuid": uuid})).data
                     lastdata = pastdata["games"][0]
                     if "gameType" in lastdata:
                         lgametype = lastdata["gameType"]
@@ -158,14 +161,12 @@ class HypixelModule(commands.Cog):
             await ctx.send(embed=warn)
             return
 
-        uuidget = requests.get(f"https://api.minetools.eu/uuid/{username}").json()
-
         try:
-            uuid = uuidget["id"]
-            playerdata = requests.get(f"https://api.hypixel.net/player?key={API_KEY}&uuid={uuid}").json()
+            uuid, name = await resolver.resolve(username)
+            playerdata = (await http_client.get_json(f"{HYPIXEL_BASE_URL}/player", params={"key": API_KEY, "uuid": uuid})).data
             bedwarsinfo = playerdata["player"]["stats"]["Bedwars"]
 
-            embed = discord.Embed(title=f"Hypixel Bedwars Statistics - {uuidget['name']}",color=0x6edd67)
+            embed = discord.Embed(title=f"Hypixel Bedwars Statistics - {name}",color=0x6edd67)
 
             experience = bedwarsinfo.get("Experience", "0")
             coins = bedwarsinfo.get("coins", "0")
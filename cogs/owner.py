@@ -34,6 +34,7 @@ from pytz import timezone
 from pymongo import MongoClient
 
 import global_vars
+from utils.warmup import Warmup, not_ready_embed
 
 tzone = timezone("Australia/Sydney")
 
@@ -53,10 +54,17 @@ MONGO_USER = quote_plus(config["MONGODB_USER"])
 MONGO_PW = quote_plus(config["MONGODB_PASSWORD"])
 MONGO_URL = config["MONGODB_URL"]
 
-cluster = MongoClient(f"mongodb+srv://{MONGO_USER}:{MONGO_PW}@{MONGO_URL}")
-db = cluster["discordbot"]
-settings = db["settings"]
-saved_settings = list(settings.find())
+# Connected in the background by the cog's warm-up
+cluster = None
+settings = None
+
+def load_settings():
+    global cluster, settings
+
+    cluster = MongoClient(f"mongodb+srv://{MONGO_USER}:{MONGO_PW}@{MONGO_URL}")
+    db = cluster["discordbot"]
+    settings = db["settings"]
+    return list(settings.find())
 
 tracemalloc.start()
 
@@ -68,11 +76,23 @@ class OwnerCommands(commands.Cog):
             self.process_mem_check.start()
             self.bot_logging.start()
 
+        self.warmup = Warmup("settings")
+
+    async def cog_load(self):
+        self.warmup.start(self.warm_up)
+
+    async def warm_up(self):
+        loop = asyncio.get_event_loop()
+        saved_settings = await loop.run_in_executor(None, load_settings)
+
         try:
             global_vars.exclusive_users = saved_settings[0]["exclusers"]
         except:
             pass
 
+    async def cog_unload(self):
+        self.warmup.cancel()
+
     @commands.command()
     async def logmemd(self, ctx):
         if ctx.message.author.id == BOT_OWNER:
@@ -511,6 +531,11 @@ class OwnerCommands(commands.Cog):
             except:
                 pass
 
+            if not await self.warmup.wait():
+                await ctx.send(embed=not_ready_embed(f"Requested by {ctx.author.name}.", "Exclusive Users"))
+                return
+
+            loop = asyncio.get_event_loop()
             embed = discord.Embed(title="Exclusive Users", color=0xf5c242)
 
             if args[0] == "add":
@@ -518,7 +543,7 @@ class OwnerCommands(commands.Cog):
                     userid = args[1]
                     global_vars.exclusive_users.append(userid)
                     wmsg = f'Appended user {userid} to exclusive users.'
-                    settings.update_one({"scope":"global"}, {"$set": {"exclusers":global_vars.exclusive_users}})
+                    await loop.run_in_executor(None, lambda: settings.update_one({"scope":"global"}, {"$set": {"exclusers":global_vars.exclusive_users}}))
                 else:
                     wmsg = 'Please input a user to append to exclusive users. .exclusive add <User ID>'
 
@@ -530,7 +555,7 @@ class OwnerCommands(commands.Cog):
                     userid = args[1]
                     global_vars.exclusive_users.remove(userid)
                     wmsg = f'Removed user {userid} from exclusive users.'
-                    settings.update_one({"scope":"global"}, {"$set": {"exclusers":global_vars.exclusive_users}})
+                    await loop.run_in_executor(None, lambda: settings.update_one({"scope":"global"}, {"$set": {"exclusers":global_vars.exclusive_users}}))
                 else:
                     wmsg = 'Please input a user to remove from exclusive users. .exclusive remove <User ID>'
 
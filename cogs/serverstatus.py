@@ -2,6 +2,7 @@ import os
 import socket
 import io
 import base64
+import asyncio
 from urllib.parse import quote_plus
 
 import discord
@@ -10,6 +11,8 @@ from pymongo import MongoClient
 from mcstatus import JavaServer
 from dotenv import dotenv_values
 
+from utils.warmup import Warmup, not_ready_embed
+
 # Bot Setup
 BASEDIR = os.path.abspath(os.path.dirname(__file__))
 ENV_POS = os.path.join(BASEDIR, '../.env')
@@ -24,11 +27,10 @@ MONGO_PW = quote_plus(config["MONGODB_PASSWORD"])
 MONGO_URL = config["MONGODB_URL"]
 BOT_OWNER = int(config["BOT_OWNER"])
 
-cluster = MongoClient(f"mongodb+srv://{MONGO_USER}:{MONGO_PW}@{MONGO_URL}")
-db = cluster["discordbot"]
-defaults = db["defaults"]
-
-default_servers = [*defaults.find()]
+# Connected in the background by the cog's warm-up
+cluster = None
+defaults = None
+default_servers = []
 
 ERROR_HEX = 0xeb1515
 SUCCESS_HEX = 0x6edd67
@@ -39,7 +41,29 @@ def getindex(lst, key, value):
             return i
     return None
 
+def load_defaults():
+    global cluster, defaults, default_servers
+
+    cluster = MongoClient(f"mongodb+srv://{MONGO_USER}:{MONGO_PW}@{MONGO_URL}")
+    db = cluster["discordbot"]
+    defaults = db["defaults"]
+    default_servers = [*defaults.find()]
+
 class ServerStatus(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.warmup = Warmup("server status")
+
+    async def cog_load(self):
+        self.warmup.start(self.warm_up)
+
+    async def warm_up(self):
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, load_defaults)
+
+    async def cog_unload(self):
+        self.warmup.cancel()
+
     @commands.hybrid_command(name="status")
     async def status(self, ctx: commands.Context, server_ip: str = None) -> None:
         """Displays status information about an inputted or default server. (.status <Optional: server_ip> or /status <Optional: server_ip>"""
@@ -67,6 +91,10 @@ class ServerStatus(commands.Cog):
                 await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
                 return
 
+            if not await self.warmup.wait():
+                await ctx.send(embed=not_ready_embed(requester, "Error - Default Server Status"))
+                return
+
             defaults_index = getindex(default_servers, "guildid", ctx.guild.id)
 
             if defaults_index is None:
@@ -215,15 +243,20 @@ class ServerStatus(commands.Cog):
             await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
             return
         
+        if not await self.warmup.wait():
+            await ctx.send(embed=not_ready_embed(requester, "Error - Default Server Status"))
+            return
+
         guild_id = ctx.guild.id
         defaults_index = getindex(default_servers, "guildid", guild_id)
+        loop = asyncio.get_event_loop()
 
-        if defaults_index is None:
-            defaults.update_one({"guildid":guild_id}, {"$set":{"serverip":server_ip}})
+        if defaults_index is not None:
+            await loop.run_in_executor(None, lambda: defaults.update_one({"guildid":guild_id}, {"$set":{"serverip":server_ip}}))
             del default_servers[defaults_index]
             default_servers.append({"guildid":guild_id, "serverip":server_ip})
         else:
-            defaults.insert_one({"guildid":guild_id, "serverip":server_ip})
+            await loop.run_in_executor(None, lambda: defaults.insert_one({"guildid":guild_id, "serverip":server_ip}))
             default_servers.append({"guildid":guild_id, "serverip":server_ip})
 
         success_embed_dict = {
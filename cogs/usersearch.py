@@ -1,11 +1,16 @@
+from uuid import UUID
+
 import discord
 from discord.ext import commands
-import requests
+
+from utils import http_client
+from utils.name_resolver import resolver
 
 ERROR_HEX = 0xeb1515
 SUCCESS_HEX = 0x6edd67
 
 PLAYERDB_MINECRAFT_API = "https://playerdb.co/api/player/minecraft/"
+CRAFTHEAD_AVATAR_URL = "https://crafthead.net/avatar"
 
 class UserSearch(commands.Cog):
     @commands.hybrid_command(name="user")
@@ -16,31 +21,44 @@ class UserSearch(commands.Cog):
             await ctx.interaction.response.defer(ephemeral=True)
         requester = f"Requested by {ctx.author.name}."
 
-        request = requests.get(f"{PLAYERDB_MINECRAFT_API}{search}", timeout=10)
-        request_data = request.json()
+        cached = resolver.cached(search)
 
-        if (request.status_code != requests.codes['ok']):
-            error_embed_dict = {
-                "title": "Error - User Search",
-                "footer": {
-                    "text": requester
-                },
-                "color": ERROR_HEX,
-                "fields": [
-                    {
-                        "name": f"{request_data.message}",
-                        "value": f"No user was found with the username or UUID '{discord.utils.escape_markdown(search)}'"
-                    }
-                ]
-            }
-
-            await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
-            return
-        
-        cleaned_username = discord.utils.escape_markdown(request_data["data"]["player"]["username"])
-        uuid = request_data["data"]["player"]["raw_id"]
-        formatted_uuid = request_data["data"]["player"]["id"]
-        avatar = request_data["data"]["player"]["avatar"]
+        if cached:
+            uuid, username = cached
+            formatted_uuid = str(UUID(uuid))
+            avatar = f"{CRAFTHEAD_AVATAR_URL}/{uuid}"
+        else:
+            request_data = None
+            if cached is False:
+                request = await http_client.get_json(f"{PLAYERDB_MINECRAFT_API}{search}")
+                request_data = request.data
+
+            if cached is None or request.status != 200:
+                error_embed_dict = {
+                    "title": "Error - User Search",
+                    "footer": {
+                        "text": requester
+                    },
+                    "color": ERROR_HEX,
+                    "fields": [
+                        {
+                            "name": (request_data or {}).get("message", "User Not Found"),
+                            "value": f"No user was found with the username or UUID '{discord.utils.escape_markdown(search)}'"
+                        }
+                    ]
+                }
+
+                await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
+                return
+
+            username = request_data["data"]["player"]["username"]
+            uuid = request_data["data"]["player"]["raw_id"]
+            formatted_uuid = request_data["data"]["player"]["id"]
+            avatar = request_data["data"]["player"]["avatar"]
+
+            resolver.observe(uuid, username)
+
+        cleaned_username = discord.utils.escape_markdown(username)
 
         success_embed_dict = {
             "title": f"User Search - {cleaned_username}",
@@ -1,17 +1,17 @@
 # Imports
 import asyncio
 import os
-import time
 import json
 import ast
-from concurrent.futures import ThreadPoolExecutor
 
-import requests
 import discord
 from discord.ext import commands, tasks
 from dotenv import dotenv_values
 
 import global_vars
+from utils import http_client, rate_limit
+from utils.guild_index import index as guild_index
+from utils.warmup import Warmup
 
 # Bot Setup
 BASEDIR = os.path.abspath(os.path.dirname(__file__))
@@ -24,6 +24,10 @@ config = {
 
 USER_KEY = config["PASTEE_USER_KEY"]
 WYNN_TOKEN = config["WYNNCRAFT_API_TOKEN"]
+WYNN_RATE_LIMIT = float(config.get("WYNN_RATE_LIMIT", 180))
+FETCH_CONCURRENCY = 8
+# More disbands than this share of the index in one run is taken as a bad guildList response
+MAX_REMOVAL_SHARE = 0.05
 
 PASTEE_BASE_URL = "https://api.paste.ee/v1/pastes"
 WYNN_BASE_URL = "https://api.wynncraft.com/public_api.php"
@@ -34,28 +38,24 @@ PASTE_NAME = "Guild List"
 
 paste_headers = {'X-Auth-Token': USER_KEY}
 wynn_headers = {"apikey": WYNN_TOKEN}
+wynn_limiter = rate_limit.bucket_for(WYNN_TOKEN, WYNN_RATE_LIMIT)
 
-def get_key(title):
-    request = requests.get(PASTEE_BASE_URL, headers=paste_headers, timeout=10)
-    if request.status_code != 200:
-        pass
-    paste_lst = request.json()
+async def get_key(title):
+    request = await http_client.get_json(PASTEE_BASE_URL, headers=paste_headers)
+    paste_lst = request.data
     for paste in paste_lst["data"]:
         if paste["description"] == title:
             return paste["id"]
 
     payload = {"description": title, "expiration": "31536000", "sections": [{"contents": str({})}]}
-    send = requests.post(PASTEE_BASE_URL, json=payload, headers=paste_headers, timeout=10).json()
-    return send["id"]
+    send = await http_client.post_json(PASTEE_BASE_URL, payload, headers=paste_headers)
+    return send.data["id"]
 
-def paste_fetch(title):
-    key = get_key(title)
+async def paste_fetch(title):
+    key = await get_key(title)
 
-    request = requests.get(f"{PASTEE_BASE_URL}/{key}", headers=paste_headers, timeout=10)
-    if request.status_code != 200:
-        pass
-    paste_data = request.text
-    loaded = json.loads(paste_data.replace("\'","\""))
+    request = await http_client.get_json(f"{PASTEE_BASE_URL}/{key}", headers=paste_headers)
+    loaded = request.data
     data = loaded["paste"]["sections"][0]["contents"]
     try:
         data = json.loads(data)
@@ -63,56 +63,98 @@ def paste_fetch(title):
         data = ast.literal_eval(data)
     return data
 
-def guild_list_update():
-    guild_list = global_vars.guild_list
-
-    key = get_key(PASTE_NAME)
-
-    guilds_fetched_list = requests.get(WYNN_GUILD_LIST_URL, params=wynn_headers, timeout=10).json()
-
-    checklist = []
-
-    for guildname in guilds_fetched_list['guilds']:
-        if guildname not in guild_list.values() and not any(guildname in guildnames for guildnames in guild_list.values()):
-            checklist.append(guildname)
-
-    for guildname in checklist:
-        request = requests.get(f"{WYNN_GUILD_STATS_URL}&command={guildname}", params=wynn_headers, timeout=10)
-        if request.status_code != 200:
+async def fetch_prefix(guildname, limiter):
+    async with limiter:
+        try:
+            request = await http_client.get_json(f"{WYNN_GUILD_STATS_URL}&command={guildname}", params=wynn_headers, limiter=wynn_limiter)
+        except http_client.RequestFailed:
+            return None
+    if request.status != 200 or not request.data or "prefix" not in request.data:
+        return None
+    return request.data["prefix"]
+
+async def guild_list_update():
+    request = await http_client.get_json(WYNN_GUILD_LIST_URL, params=wynn_headers, limiter=wynn_limiter)
+    if request.status != 200 or not request.data or not isinstance(request.data.get("guilds"), list):
+        return None
+
+    # Only guilds missing from the index are looked up, guilds that failed are retried next run
+    listed = set(request.data["guilds"])
+    new, gone = guild_index.diff(listed)
+    if not listed or len(gone) > MAX_REMOVAL_SHARE * len(guild_index):
+        # A truncated or empty list would wipe the index and its backup, so nothing is removed this run
+        print(f"Guild list lists {len(listed)} guilds and drops {len(gone)}, skipping removals")
+        gone = set()
+    gone_prefixes = {guild_index.remove(guildname): guildname for guildname in gone}
+
+    limiter = asyncio.Semaphore(FETCH_CONCURRENCY)
+    new = list(new)
+    prefixes = await asyncio.gather(*(fetch_prefix(guildname, limiter) for guildname in new))
+
+    added = renamed = 0
+    for guildname, prefix in zip(new, prefixes):
+        if prefix is None:
             continue
-        guild_stats = request.json()
-        prefix = (guild_stats["prefix"]).lower()
-
-        if prefix in guild_list:
-            guild_list[prefix] += f'|{guildname}'
+        guild_index.add(guildname, prefix)
+        if prefix.lower() in gone_prefixes:
+            # A guild which disappeared under the same prefix in this run was renamed
+            renamed += 1
         else:
-            guild_list[prefix] = guildname
-        time.sleep(0.6)
+            added += 1
+
+    return {"added": added, "renamed": renamed, "disbanded": len(gone) - renamed}
 
-    requests.delete(f"https://api.paste.ee/v1/pastes/{key}", headers=paste_headers, timeout=10).json()
+async def upload_guild_list():
+    key = await get_key(PASTE_NAME)
+    if key:
+        await http_client.delete(f"{PASTEE_BASE_URL}/{key}", headers=paste_headers)
 
-    payload = {"description":PASTE_NAME, "expiration":"31536000", "sections":[{"contents":str(guild_list).replace("\'","\"")}]}
-    requests.post("https://api.paste.ee/v1/pastes", json=payload, headers=paste_headers, timeout=10)
+    payload = {"description":PASTE_NAME, "expiration":"31536000", "sections":[{"contents":json.dumps(guild_index.to_dict())}]}
+    await http_client.post_json(PASTEE_BASE_URL, payload, headers=paste_headers)
 
 class GuildListUpdater(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-        if not global_vars.guild_list:
-            try:
-                global_vars.guild_list = paste_fetch(PASTE_NAME)
-            except:
-                pass
+        self.warmup = Warmup("guild list")
+        self.uploaded_version = None
+
+    async def cog_load(self):
+        # The stored index is loaded in the background so the extension loads without waiting on paste.ee
+        self.warmup.start(self.warm_up)
 
         if not global_vars.dev_mode:
             self.run_playtime_update.start()
 
+    async def warm_up(self):
+        if guild_index.load():
+            return
+        # No local copy yet, seed it from the remote backup
+        guild_index.update_from(await paste_fetch(PASTE_NAME))
+        guild_index.save()
+        self.uploaded_version = guild_index.version
+
     async def cog_unload(self):
+        self.warmup.cancel()
         self.run_playtime_update.cancel()
 
     @tasks.loop(hours=12)
     async def run_playtime_update(self):
-        await asyncio.get_event_loop().run_in_executor(ThreadPoolExecutor(), guild_list_update)
+        changes = await guild_list_update()
+        if changes is None:
+            return
+        print(f"Guild list updated: {changes}")
+
+        guild_index.save()
+        # The remote backup is only replaced when the index actually changed
+        if guild_index.version != self.uploaded_version:
+            await upload_guild_list()
+            self.uploaded_version = guild_index.version
+
+    @run_playtime_update.before_loop
+    async def before_guild_list_update(self):
+        # Updating works from the stored index, so it has to be loaded first
+        await self.warmup.event.wait()
 
 async def setup(bot):
     await bot.add_cog(GuildListUpdater(bot))
@@ -1,27 +1,30 @@
-import ast
 import asyncio
-import base64
-import copy
 import datetime
 import os
 import time
-import json
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
-from urllib.parse import quote_plus
 
 import discord
-import github
-import requests
 from dotenv import dotenv_values
-from pytz import timezone
-from github import Github
-from urllib3 import Retry
 from discord.ext import tasks, commands
-from pymongo import MongoClient
-from bitdotio import bitdotio
 
 import global_vars
+from tracker import (POLL_INTERVAL, TIMEZONE, WYNN_GUILD_STATS_URL, Tracker, guilds_to_check, prefix_to_name,
+                     wynn_headers, wynn_limiter)
+from utils import http_client
+from utils.rate_limit import INTERACTIVE
+from utils.embed_layout import send_paginated
+from utils.guild_index import index as guild_index
+from utils.guild_search import search as guild_search
+from utils.last_seen import last_seen
+from utils.name_resolver import resolver
+from utils.playtime_cache import PlaytimeCache
+from utils.playtime_store import PlaytimeStore, hour_bounds
+from utils.alerts import AlertDispatcher
+from utils.roster_diff import parse_alert_channels
+from utils.progress import ProgressReporter
+from utils.tracker_state import STATE_POS, EventReader, load_state, modified_at
+from utils.warmup import Warmup, not_ready_embed
 
 # Bot Setup
 BASEDIR = os.path.abspath(os.path.dirname(__file__))
@@ -32,50 +35,21 @@ config = {
     **os.environ,
 }
 
-USER_KEY = config["PASTEE_USER_KEY"]
-WYNN_TOKEN = config["WYNNCRAFT_API_TOKEN"]
-TIMEZONE = timezone(config["BOT_TIMEZONE"])
-GITHUB_PAT = config["GITHUB_PACKWATCHERBOT_TOKEN"]
-MONGO_USER = quote_plus(config["MONGODB_USER"])
-MONGO_PW = quote_plus(config["MONGODB_PASSWORD"])
-MONGO_URL = config["MONGODB_URL"]
 BOT_OWNER = int(config["BOT_OWNER"])
-BITIO_READ = config["BITIO_READ"]
-BITIO_EDIT = config["BITIO_EDIT"]
-
-PASTEE_BASE_URL = "https://api.paste.ee/v1/pastes"
-WYNN_BASE_URL = "https://api.wynncraft.com/public_api.php"
-WYNN_ONLINE_PLAYERS_URL = f"{WYNN_BASE_URL}?action=onlinePlayers"
-WYNN_GUILD_STATS_URL = f"{WYNN_BASE_URL}?action=guildStats"
-PLAYERDB_MINECRAFT_API = "https://playerdb.co/api/player/minecraft"
-MINETOOLS_PROFILE_API = "https://api.minetools.eu/profile"
-MINETOOLS_UUID_API = "https://api.minetools.eu/uuid"
-
-PASTE_NAME = "Guild Playtime Change Data"
-PLAYTIME_GIT = "playtime.txt"
-MEMBERS_GIT = "members.txt"
-ERROR_HEX = 0xeb1515
-SUCCESS_HEX = 0x6edd67
-EMBED_LIMIT = 5000
-
-nia_alert_channels = [861058162354159616,766402801479188490]
-lxa_alert_channels = [863897825119830036]
+# "remote" leaves tracking to tracker_daemon.py, the cog then only serves commands and alerts
+TRACKER_MODE = config.get("TRACKER_MODE", "local")
 
-paste_headers = {'X-Auth-Token': USER_KEY}
-wynn_headers = {"apikey": WYNN_TOKEN}
+WYNN_PLAYER_STATS_URL = "https://api.wynncraft.com/v2/player"
 
-#github repo setup
-retry_obj = Retry(total = 10, status_forcelist = (500, 502, 504), backoff_factor = 0.3)
-git = Github(GITHUB_PAT, retry = retry_obj)
-repo = git.get_user().get_repo("packwatcher-data")
-
-cluster = MongoClient(f"mongodb+srv://{MONGO_USER}:{MONGO_PW}@{MONGO_URL}")
-db = cluster["discordbot"]
-settings = [*db["settings"].find()][0]
-
-bitio = bitdotio(BITIO_EDIT)
+ERROR_HEX = 0xeb1515
+SUCCESS_HEX = 0x6edd67
+ACTIVITY_CONCURRENCY = 10
+LAST_JOIN_TTL = 15 * 60
+FOLLOW_INTERVAL = 10
 
-guilds_to_check = json.loads(config["GUILDS"])
+# Guild prefix -> channels member changes are announced in, guilds without any aren't announced
+DEFAULT_ALERT_CHANNELS = {"Nia": [861058162354159616, 766402801479188490], "LXA": [863897825119830036]}
+alert_channels = parse_alert_channels(config.get("GUILD_ALERT_CHANNELS"), DEFAULT_ALERT_CHANNELS)
 
 def rank_select(value):
     rankselection = {"OWNER":1,"CHIEF":2,"STRATEGIST":3,"CAPTAIN":4,"RECRUITER":5,"RECRUIT":6,"NOT IN GUILD":7}
@@ -91,48 +65,6 @@ def get_index(lst, key, value):
             return i
     return None
 
-def get_key(title):
-    request = requests.get(PASTEE_BASE_URL, headers=paste_headers, timeout=10)
-    if request.status_code != 200:
-        pass
-    paste_lst = request.json()
-    for paste in paste_lst["data"]:
-        if paste["description"] == title:
-            return paste["id"]
-
-    payload = {"description": title, "expiration": "31536000", "sections": [{"contents": str({})}]}
-    send = requests.post(PASTEE_BASE_URL, json=payload, headers=paste_headers, timeout=10).json()
-    return send["id"]
-
-def paste_fetch(title):
-    key = get_key(title)
-
-    request = requests.get(f"{PASTEE_BASE_URL}/{key}", headers=paste_headers, timeout=10)
-    if request.status_code != 200:
-        pass
-    paste_data = request.text
-    loaded = json.loads(paste_data.replace("\'","\""))
-    data = loaded["paste"]["sections"][0]["contents"]
-    try:
-        data = json.loads(data)
-    except json.decoder.JSONDecodeError:
-        data = ast.literal_eval(data)
-    return data
-
-def get_repo_data(filename):
-    try:
-        data = repo.get_contents(filename).decoded_content.decode().replace("'","\"")
-        return (repo.get_contents(filename), json.loads(data))
-    except AssertionError:
-        ref = repo.get_git_ref("heads/main")
-        tree = repo.get_git_tree(ref.object.sha, recursive='/' in filename).tree
-        sha = [x.sha for x in tree if x.path == filename]
-        if not sha:
-            file = repo.create_file(filename, "Automated Data Generation","{}")["content"]
-            return(file, {})
-        data = base64.b64decode(repo.get_git_blob(sha[0]).content).decode().replace("'","\"")
-        return (repo.get_git_blob(sha[0]), json.loads(data))
-
 def str_to_int(string: str, positive: bool = False):
     try:
         num = int(string)
@@ -142,374 +74,116 @@ def str_to_int(string: str, positive: bool = False):
         return None
     return num
 
-def prefix_to_name(prefix: str):
-    for guild in guilds_to_check:
-        if prefix == guilds_to_check[guild][1]:
-            return guild
-    return None
-
 class PlaytimeUpdater(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-        self.stored_playtime = {}
-        self.stored_hour = -1
-        self.stored_day = -1
-        self.daily_members = {}
-        self.hourly_playtime = []
-        self.stored_changing = {}
-        self.stored_members = {}
-        self.changing_counter = 5
-        self.members_change = {'lxa':[[], []], 'nia':[[], []]}
-
-        self.playtime_file = None
-        self.members_file = None
-
-        #Fetches data if not present
-        try:
-            if not self.stored_playtime:
-                self.playtime_file, self.stored_playtime = get_repo_data(PLAYTIME_GIT)
-        except:
-            pass
-        try:
-            if not self.stored_changing:
-                self.stored_changing = paste_fetch(PASTE_NAME)
-        except:
-            pass
-        try:
-            if not self.stored_members:
-                self.members_file, self.stored_members = get_repo_data(MEMBERS_GIT)
-        except:
-            pass
-
-        if not global_vars.dev_mode:
-            self.run_playtime_update.start()
+        self.playtime_cache = PlaytimeCache()
+        self.alerts = AlertDispatcher(bot, resolver)
+        self.last_joins = {}
+
+        if TRACKER_MODE == "remote":
+            # Playtime and member changes come from the tracker daemon through the data directory
+            self.tracker = None
+            self.warmup = Warmup("playtime")
+            self.shared_playtime = PlaytimeStore()
+            self.state_modified = None
+            self.last_seen_modified = None
+            self.events = EventReader()
+        else:
+            self.tracker = Tracker(self.playtime_cache)
+            self.warmup = self.tracker.warmup
+
+    @property
+    def stored_playtime(self):
+        return self.tracker.stored_playtime if self.tracker else self.shared_playtime
+
+    async def cog_load(self):
+        # State is fetched in the background so the extension loads without waiting on GitHub/paste.ee
+        if self.tracker:
+            self.warmup.start(self.tracker.warm_up)
+            if not global_vars.dev_mode:
+                await self.tracker.start_workers()
+                self.run_playtime_update.start()
+        else:
+            self.warmup.start(self.load_shared_state)
+            self.follow_tracker.start()
 
     async def cog_unload(self):
         self.run_playtime_update.cancel()
-
-    def playtime_update(self):
-        #Fetches data if not present
-        if not self.stored_playtime:
-            self.playtime_file, self.stored_playtime = get_repo_data(PLAYTIME_GIT)     
-        if not self.stored_changing:
-            self.stored_changing = paste_fetch(PASTE_NAME)
-        if not self.stored_members:
-            self.members_file, self.stored_members = get_repo_data(MEMBERS_GIT)
-
-        # Removes data more than two months in the past
-        to_delete = []
-        for time_set in self.stored_playtime:
-            if datetime.strptime(time_set, "%H-%d/%m/%y").astimezone(TIMEZONE) < (datetime.now(TIMEZONE) - timedelta(days=62)):
-                to_delete.append(time_set)
-            else:
-                break
-        
-        for time_set in to_delete:
-            del self.stored_playtime[time_set]
-        
-        to_delete = []
-        for time_set in self.stored_members:
-            if datetime.strptime(time_set, "%d/%m/%y").astimezone(TIMEZONE) < (datetime.now(TIMEZONE) - timedelta(days=62)):
-                to_delete.append(time_set)
-            else:
-                break
-
-        for time_set in to_delete:
-            del self.stored_members[time_set]
-
-        old_stored = copy.deepcopy(self.stored_playtime)
-        old_members = copy.deepcopy(self.stored_members)
-
-        all_players = []
-
-        #gets list of all players online
-        request = requests.get(WYNN_ONLINE_PLAYERS_URL, params=wynn_headers, timeout=10)
-
-        if request.status_code != 200:
-            return
-        online_players = request.json()
-        for world in online_players:
-            if world != "request":
-                all_players.extend(online_players[world])
-
-        #gets current time
-        now_time = datetime.now(TIMEZONE)
-        text_time = now_time.strftime("%H-%d/%m/%y")
-        text_day = now_time.strftime("%d/%m/%y")
-        prev_text_day = (now_time - timedelta(days=1)).strftime("%d/%m/%y")
-
-        guild_players, guild_players_id = self.get_guild_members(guilds_to_check)
-
-        for player in all_players:
-            if any(player in guild_players[prefix] for prefix in guild_players) and player not in self.stored_changing:
-                self.stored_changing[player] = int(time.time())
-
-        self.stored_members[text_day] = guild_players_id
-        self.daily_members = guild_players_id
-
-        to_clear = self.update_stored_data(all_players, guild_players, text_time)
-
-        for player in (to_clear):
-            try:
-                del self.stored_changing[player]
-            except KeyError:
-                pass
-
-        self.changing_counter += 1
-
-        if self.changing_counter >= 5:
-
-            self.changing_counter = 0
-
-            #update pastes
-            ckey = get_key(PASTE_NAME)
-            requests.delete(f"{PASTEE_BASE_URL}/{ckey}", headers=paste_headers, timeout=10)
-
-            changing_payload = {
-                "description": PASTE_NAME,
-                "expiration": "31536000",
-                "sections": [
-                    {"contents": str(self.stored_changing).replace("\'","\"")}
-                ]
-            }
-            requests.post(PASTEE_BASE_URL, json=changing_payload, headers=paste_headers, timeout=10)
-
-            if not self.stored_playtime or self.stored_playtime != old_stored:
-                if self.playtime_file:
-                    try:
-                        self.playtime_file = repo.update_file(PLAYTIME_GIT, "Automated Data Generation", str(self.stored_playtime), self.playtime_file.sha)["content"]
-                    except github.GithubException:
-                        raise
-                        pass
-                else:
-                    try:
-                        self.playtime_file = repo.create_file(PLAYTIME_GIT, "Automated Data Generation", str(self.stored_playtime))["content"]
-                    except github.GithubException:
-                        raise
-                        pass
-            if not self.stored_members or self.stored_members != old_members:
-                if self.members_file:
-                    try:
-                        self.members_file = repo.update_file(MEMBERS_GIT, "Automated Data Generation", str(self.stored_members), self.members_file.sha)["content"]
-                    except github.GithubException:
-                        pass
-                else:
-                    try:
-                        self.members_file = repo.create_file(MEMBERS_GIT, "Automated Data Generation", str(self.stored_members))["content"]
-                    except github.GithubException:
-                        pass
-
-        try:
-            if self.stored_members[text_day]["Nia"] != guild_players_id["Nia"]:
-                leftmem = [uuid for uuid in self.stored_members[text_day]["Nia"] if uuid not in guild_players_id["Nia"]]
-                self.members_change['nia'][1].extend(leftmem)
-                joinmem = [uuid for uuid in guild_players_id["Nia"] if uuid not in self.stored_members[text_day]["Nia"]]
-                self.members_change['nia'][0].extend(joinmem)
-        except:
-            try:
-                if self.stored_members[prev_text_day]["Nia"] != guild_players_id["Nia"]:
-                    leftmem = [uuid for uuid in self.stored_members[prev_text_day]["Nia"] if uuid not in guild_players_id["Nia"]]
-                    self.members_change['nia'][1].extend(leftmem)
-                    joinmem = [uuid for uuid in guild_players_id["Nia"] if uuid not in self.stored_members[prev_text_day]["Nia"]]
-                    self.members_change['nia'][0].extend(joinmem)
-            except:
-                pass
-
-        try:
-            if self.stored_members[text_day]["LXA"] != guild_players_id["LXA"]:
-                leftmem = [uuid for uuid in self.stored_members[text_day]["LXA"] if uuid not in guild_players_id["LXA"]]
-                self.members_change['lxa'][1].extend(leftmem)
-                joinmem = [uuid for uuid in guild_players_id["LXA"] if uuid not in self.stored_members[text_day]["LXA"]]
-                self.members_change['lxa'][0].extend(joinmem)
-        except:
-            try:
-                if self.stored_members[prev_text_day]["LXA"] != guild_players_id["LXA"]:
-                    leftmem = [uuid for uuid in self.stored_members[prev_text_day]["LXA"] if uuid not in guild_players_id["LXA"]]
-                    self.members_change['lxa'][1].extend(leftmem)
-                    joinmem = [uuid for uuid in guild_players_id["LXA"] if uuid not in self.stored_members[prev_text_day]["LXA"]]
-                    self.members_change['lxa'][0].extend(joinmem)
-            except:
-                pass
-
-    def get_guild_members(self, guild_names):
-        guild_players = {}
-        guild_players_id = {}
-
-        for guild in guild_names:
-            request = requests.get(f"{WYNN_GUILD_STATS_URL}&command={guild}", params=wynn_headers, timeout=10)
-            if request.status_code != 200:
-                continue
-            data = request.json()
-            prefix = data["prefix"]
-
-            guild_players[prefix] = [member["name"] for member in data["members"]]
-            guild_players_id[prefix] = [member["uuid"] for member in data["members"]]
-
-            for player in guild_players_id[prefix]:
-                request = requests.get(f"{MINETOOLS_PROFILE_API}/{player}", timeout=10)
-                if request.status_code != 200:
-                    continue
-                player_data = request.json()
-                username = player_data["raw"]["name"]
-                if username and username not in guild_players[prefix]:
-                    guild_players[prefix].append(username)
-
-        return guild_players, guild_players_id
-
-    def update_stored_data(self, all_players, guild_players, text_time):
-        to_clear = []
-
-        # New hour so must update database
-        try:
-           curr_time = datetime.strptime(text_time, "%H-%d/%m/%y")
-           hour_str = curr_time.strftime("%H")
-           day_str = curr_time.strftime("%d")
-           if self.stored_hour != hour_str and self.hourly_playtime:
-               self.stored_hour = hour_str
-
-               timestamp = curr_time.replace(minute=0, second=0, microsecond=0).timestamp()
-               nia_data = [{"uuid":item["uuid"], "duration":item["duration"]} for item in self.hourly_playtime if item["prefix"] == "nia"]
-               lxa_data = [{"uuid":item["uuid"], "duration":item["duration"]} for item in self.hourly_playtime if item["prefix"] == "lxa"]
-               ozi_data = [{"uuid":item["uuid"], "duration":item["duration"]} for item in self.hourly_playtime if item["prefix"] == "ozi"]
-
-               with bitio.pooled_cursor('PackWatcher/data') as cursor:
-                   cursor.execute(f"INSERT INTO playtime (timestamp, nia, lxa, ozi) VALUES ({timestamp}, {nia_data}, {lxa_data}, {ozi_data})")
-
-               self.hourly_playtime = []
-           if self.stored_day != day_str and self.daily_members:
-               self.stored_day = day_str
-
-               timestamp = curr_time.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
-               nia_data = self.daily_members["Nia"]
-               lxa_data = self.daily_members["LXA"]
-
-               with bitio.pooled_cursor('PackWatcher/data') as cursor:
-                   cursor.execute(f"INSERT INTO members (timestamp, nia, lxa) VALUES ({timestamp}, {nia_data}, {lxa_data})")
-        except:
-            pass
-
-        for player in self.stored_changing:
-            if player not in all_players:
-                if text_time not in self.stored_playtime:
-                    self.stored_playtime[text_time] = []
-
-                request = requests.get(f"{MINETOOLS_UUID_API}/{player}", timeout=10)
-                if request.status_code != 200:
-                    continue
-                data = request.json()
-                if data["status"] != "ERR":
-                    uuid = data["id"]
-
-                    prefix = next((prefix for prefix in guild_players if player in guild_players[prefix]), None)
-                    time_diff = int((int(time.time()) - self.stored_changing[player]) / 60)
-
-                    if prefix:
-                        inputted_data = {"uuid": uuid, "duration": time_diff, "guild": prefix}
-                        self.stored_playtime[text_time].append(inputted_data)
-                        self.hourly_playtime.append(inputted_data)
-
-                to_clear.append(player)
-
-        return to_clear
-
-    @tasks.loop(minutes=1)
+        self.follow_tracker.cancel()
+        if self.tracker:
+            await self.tracker.close()
+        else:
+            self.warmup.cancel()
+
+    async def load_shared_state(self):
+        # Raises until the daemon has published its first state, the warm-up retries until then
+        loop = asyncio.get_event_loop()
+        modified = modified_at(STATE_POS)
+        if modified is None:
+            raise FileNotFoundError(f"No tracker state at {STATE_POS}")
+        if modified != self.state_modified:
+            self.shared_playtime = await loop.run_in_executor(None, load_state)
+            self.state_modified = modified
+            # Leaderboards built from the previous state are stale, including ones still being built
+            self.playtime_cache.clear()
+
+        modified = modified_at(last_seen.path)
+        if modified is not None and modified != self.last_seen_modified:
+            await loop.run_in_executor(None, last_seen.load)
+            self.last_seen_modified = modified
+
+    async def announce_members(self, prefix, joined, left):
+        if prefix in alert_channels:
+            title = f"{prefix_to_name(prefix) or prefix} - Members Change"
+            await self.alerts.announce(title, joined, left, alert_channels[prefix])
+
+    async def report_error(self, error):
+        errorchannel = self.bot.get_channel(837917735089340446)
+        ertext = f"```{error}```"
+        await errorchannel.send(ertext)
+
+    @tasks.loop(seconds=POLL_INTERVAL)
     async def run_playtime_update(self):
-        await asyncio.get_event_loop().run_in_executor(ThreadPoolExecutor(), self.playtime_update)
+        await self.tracker.update()
+        self.run_playtime_update.change_interval(seconds=self.tracker.poll_scheduler.interval)
 
         try:
-            if self.members_change['nia'][1] or self.members_change['nia'][0]:
-                joinoutdata = ""
-                leftoutdata = ""
-
-                for uuid in self.members_change['nia'][1]:
-                    data = requests.get(f"{MINETOOLS_UUID_API}/{uuid}").json()
-
-                    uname = data["name"]
-                    fetuuid = data["id"]
-
-                    if leftoutdata:
-                        leftoutdata += f"\n- {uname} [{fetuuid}]"
-                    else:
-                        leftoutdata = f"- {uname} [{fetuuid}]"
-
-                for uuid in self.members_change['nia'][0]:
-                    data = requests.get(f"{MINETOOLS_UUID_API}/{uuid}").json()
+            await self.alerts.retry_failed()
 
-                    uname = data["name"]
-                    fetuuid = data["id"]
-
-                    if joinoutdata:
-                        joinoutdata += f"\n- {uname} [{fetuuid}]"
-                    else:
-                        joinoutdata = f"- {uname} [{fetuuid}]"
-
-                embed = discord.Embed(title="Nerfuria - Members Change", color=0xce34ad)
-
-                if joinoutdata:
-                    embed.add_field(name="New Members",value=joinoutdata)
-                if leftoutdata:
-                    embed.add_field(name="Ex-Members",value=leftoutdata)
-
-                req = "Automated Member Tracking"
-                embed.set_footer(text=req)
-
-                for channel_id in nia_alert_channels:
-                    try:
-                        channel = self.bot.get_channel(channel_id)
-                        await channel.send(embed=embed)
-                    except:
-                        pass
-
-            if self.members_change['lxa'][1] or self.members_change['lxa'][0]:
-                joinoutdata = ""
-                leftoutdata = ""
-
-                for uuid in self.members_change['lxa'][1]:
-                    data = requests.get(f"{MINETOOLS_UUID_API}/{uuid}").json()
-
-                    uname = data["name"]
-                    fetuuid = data["id"]
-
-                    if leftoutdata:
-                        leftoutdata += f"\n- {uname} [{fetuuid}]"
-                    else:
-                        leftoutdata = f"- {uname} [{fetuuid}]"
-
-                for uuid in self.members_change['lxa'][0]:
-                    data = requests.get(f"{MINETOOLS_UUID_API}/{uuid}").json()
-
-                    uname = data["name"]
-                    fetuuid = data["id"]
-
-                    if joinoutdata:
-                        joinoutdata += f"\n- {uname} [{fetuuid}]"
-                    else:
-                        joinoutdata = f"- {uname} [{fetuuid}]"
-
-                embed = discord.Embed(title="Lux Nova - Members Change", color=0xce34ad)
-
-                if joinoutdata:
-                    embed.add_field(name="New Members",value=joinoutdata)
-                if leftoutdata:
-                    embed.add_field(name="Ex-Members",value=leftoutdata)
-
-                req = "Automated Member Tracking"
-                embed.set_footer(text=req)
-
-                for channel_id in lxa_alert_channels:
-                    try:
-                        channel = self.bot.get_channel(channel_id)
+            for prefix, joined, left in self.tracker.roster_diff.changes():
+                await self.announce_members(prefix, joined, left)
+                self.tracker.roster_diff.clear(prefix)
+        except Exception as e:
+            await self.report_error(e)
 
-                        await channel.send(embed=embed)
-                    except:
-                        pass
+    @run_playtime_update.before_loop
+    async def before_playtime_update(self):
+        # Tracking only starts once history and open sessions are loaded
+        await self.warmup.event.wait()
 
-            self.members_change = {'lxa':[[], []], 'nia':[[], []]}
+    @tasks.loop(seconds=FOLLOW_INTERVAL)
+    async def follow_tracker(self):
+        loop = asyncio.get_event_loop()
+        try:
+            await self.load_shared_state()
+            await self.alerts.retry_failed()
+
+            # Events written while the bot was down are announced once it is back
+            events, offset = await loop.run_in_executor(None, self.events.read)
+            for event in events:
+                if event.get("type") == "members":
+                    await self.announce_members(event["prefix"], event["joined"], event["left"])
+            if events:
+                await loop.run_in_executor(None, self.events.commit, offset)
         except Exception as e:
-            errorchannel = self.bot.get_channel(837917735089340446)
-            ertext = f"```{e}```"
-            await errorchannel.send(ertext)
+            await self.report_error(e)
+
+    @follow_tracker.before_loop
+    async def before_follow_tracker(self):
+        await self.warmup.event.wait()
+        await self.bot.wait_until_ready()
 
     @commands.hybrid_command(name="playtime")
     async def playtime(self, ctx: commands.Context, form: str = None, data: str = None, members: str = None,  guild: str = None):
@@ -605,6 +279,11 @@ class PlaytimeUpdater(commands.Cog):
             await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
             return
 
+        if not await self.warmup.wait():
+            # History is still being fetched after a restart
+            await ctx.send(embed=not_ready_embed(requester, "Error - Playtime"))
+            return
+
         # Gathers required data using form argument
         if form == "from":
             # Fetch data between given dates
@@ -630,8 +309,8 @@ class PlaytimeUpdater(commands.Cog):
             if data.startswith("-"):
                 date_str = data.replace("-", "")
                 try:
-                    start_time = datetime.min
-                    end_time = datetime.strptime(date_str, "%d/%m/%y")
+                    start_time = None
+                    end_time = TIMEZONE.localize(datetime.strptime(date_str, "%d/%m/%y"))
                     title = f"{guild_prefix} Playtime - From {date_str}"
                 except ValueError:
                     error_embed_dict = {
@@ -654,8 +333,8 @@ class PlaytimeUpdater(commands.Cog):
             elif data.endswith("-"):
                 date_str = data.replace("-", "")
                 try:
-                    end_time = datetime.max
-                    start_time = datetime.strptime(date_str, "%d/%m/%y")
+                    end_time = None
+                    start_time = TIMEZONE.localize(datetime.strptime(date_str, "%d/%m/%y"))
                     title = f"{guild_prefix} Playtime - Till {date_str}"
                 except ValueError:
                     error_embed_dict = {
@@ -677,8 +356,8 @@ class PlaytimeUpdater(commands.Cog):
             else:
                 date_strs = data.split("-")
                 try:
-                    start_time = datetime.strptime(date_strs[0], "%d/%m/%y")
-                    end_time = datetime.strptime(date_strs[1], "%d/%m/%y")
+                    start_time = TIMEZONE.localize(datetime.strptime(date_strs[0], "%d/%m/%y"))
+                    end_time = TIMEZONE.localize(datetime.strptime(date_strs[1], "%d/%m/%y"))
                     title = f"{guild_prefix} Playtime - From {date_strs[0]} to {date_strs[1]}"
                 except ValueError:
                     error_embed_dict = {
@@ -717,8 +396,8 @@ class PlaytimeUpdater(commands.Cog):
 
                 await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
                 return
-            start_time = datetime.now() - timedelta(days=(30 * num))
-            end_time = datetime.max
+            start_time = datetime.now(TIMEZONE) - timedelta(days=(30 * num))
+            end_time = None
             title = f"{guild_prefix} Playtime - {num} Months"
         elif form == "w":
             # Fetch data from some amount of weeks ago
@@ -740,8 +419,8 @@ class PlaytimeUpdater(commands.Cog):
 
                 await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
                 return
-            start_time = datetime.now() - timedelta(weeks=num)
-            end_time = datetime.max
+            start_time = datetime.now(TIMEZONE) - timedelta(weeks=num)
+            end_time = None
             title = f"{guild_prefix} Playtime - From {num} Weeks"
         elif form == "d":
             # Fetch data from some amount of days ago
@@ -763,8 +442,8 @@ class PlaytimeUpdater(commands.Cog):
 
                 await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
                 return
-            start_time = datetime.now() - timedelta(days=num)
-            end_time = datetime.max
+            start_time = datetime.now(TIMEZONE) - timedelta(days=num)
+            end_time = None
             title = f"{guild_prefix} Playtime - From {num} Days"
         elif form == "h":
             # Fetch data from some amount of days ago
@@ -786,35 +465,70 @@ class PlaytimeUpdater(commands.Cog):
 
                 await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
                 return
-            start_time = datetime.now() - timedelta(hours=num)
-            end_time = datetime.max
+            start_time = datetime.now(TIMEZONE) - timedelta(hours=num)
+            end_time = None
             title = f"{guild_prefix} Playtime - From {num} Hours"
         else:
             # Fetch data from all time with current members
-            start_time = datetime.min
-            end_time = datetime.max
+            start_time = None
+            end_time = None
             title = f"{guild_prefix} Playtime - All"
 
-        # Gets all data sets between the given times
-        data_sets = {}
-        for time_value in self.stored_playtime:
-            datetime_object = datetime.strptime(time_value, "%H-%d/%m/%y")
-            if start_time < datetime_object < end_time:
-                data_sets[time_value] = self.stored_playtime[time_value]
+        # Leaderboards are cached per window until a session lands in it or the guild's roster changes
+        start_hour, end_hour = hour_bounds(start_time, end_time)
+        cache_key = (guild_prefix, start_hour, end_hour, members == "all")
+        publishable_stats = self.playtime_cache.get(*cache_key)
+        if publishable_stats is None:
+            token = self.playtime_cache.begin(*cache_key)
+            try:
+                publishable_stats = await self.build_playtime_stats(ctx, guild_prefix, start_time, end_time, members)
+                self.playtime_cache.put(*cache_key, publishable_stats, token)
+            finally:
+                self.playtime_cache.end(*cache_key)
 
-        request = requests.get(f"{WYNN_GUILD_STATS_URL}&command={prefix_to_name(guild_prefix)}", params=wynn_headers, timeout=10)
-        guild_data = request.json()
+        if not publishable_stats:
+            error_embed_dict = {
+                "title": "Error - Playtime",
+                "footer": {
+                    "text": requester
+                },
+                "color": ERROR_HEX,
+                "fields": [
+                    {
+                        "name": "No Data Found",
+                        "value": "No playtime information was found during this period."
+                    }
+                ]
+            }
+
+            await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
+            return
+
+        #send message
+        rows = []
+        for player in publishable_stats:
+            playtime = player["total"]
+            if len(str(playtime)) > 3:
+                playtime = '{:,}'.format(playtime).replace(","," ")
+            rows.append((rank_select(player["rank"]), f"{player['name']} : {playtime} minutes"))
+
+        await send_paginated(ctx, title, rows, SUCCESS_HEX, requester)
 
-        active_members = [str(member["uuid"]).replace("-","") for member in guild_data["members"]]
+    async def build_playtime_stats(self, ctx, guild_prefix, start_time, end_time, members):
+        # Gets pre-summed member totals between the given times
+        member_totals = self.stored_playtime.totals(start_time, end_time)
+
+        request = await http_client.get_json(f"{WYNN_GUILD_STATS_URL}&command={prefix_to_name(guild_prefix)}", params=wynn_headers, limiter=wynn_limiter, priority=INTERACTIVE)
+        guild_data = request.data
+
+        member_ranks = {str(member["uuid"]).replace("-",""): member["rank"] for member in guild_data["members"]}
+        active_members = member_ranks.keys()
 
         playtime_stats = {}
 
-        for time_set in enumerate(data_sets.items()):
-            user_sets = time_set[1][1]
-            for user_set in user_sets:
-                uuid = user_set["uuid"].replace("-","")
-                if (members == "all" and user_set["guild"] == guild_prefix) or (members != "all" and uuid in active_members):
-                    playtime_stats[uuid] = user_set["duration"] if uuid not in playtime_stats else (playtime_stats[uuid] + user_set["duration"])
+        for (uuid, member_guild), duration in member_totals.items():
+            if (members == "all" and member_guild == guild_prefix) or (members != "all" and uuid in active_members):
+                playtime_stats[uuid] = duration if uuid not in playtime_stats else (playtime_stats[uuid] + duration)
 
         for member_uuid in active_members:
             if member_uuid not in playtime_stats:
@@ -823,422 +537,187 @@ class PlaytimeUpdater(commands.Cog):
         publishable_stats = []
         total = len(playtime_stats)
         count = 0
-        last = 0
-
-        req = "Please wait, this process may take a few minutes..."
-        pmsg = f"0/{total} checks completed: 0.0% done."
-        prg_title = f"Playtime Check Progress - {guild_prefix}"
-        progress = discord.Embed(title=prg_title, color=0xf5c242)
 
-        progress.add_field(name="Checks Completed", value=pmsg, inline=True)
-        progress.set_footer(text=req)
-
-        pmessage = await ctx.channel.send(embed=progress)
+        progress = await ProgressReporter(f"Playtime Check Progress - {guild_prefix}", total).start(ctx.channel.send)
 
         for i in enumerate(playtime_stats.items()):
             count += 1
+            progress.update(count)
 
             player = i[1][0]
             total_playtime = i[1][1]
-            request = requests.get(f"{MINETOOLS_PROFILE_API}/{player}", timeout=10)
-            if request.status_code != 200:
+            try:
+                username = await resolver.get_name(player)
+            except http_client.RequestFailed:
                 continue
-            player_data = request.json()
-            if player_data["raw"]["status"] == "ERR":
+            if not username:
                 continue
-            username = player_data["raw"]["name"]
-            rank = rank_select(next(data_set for data_set in guild_data["members"] if str(data_set["uuid"]).replace("-", "") == player)["rank"])
-            publishable_stats.append({"name": username, "total": total_playtime, "rank": rank})
-
-            if (count == last + 20) or (count + 3 > total):
-                #embed update
-                req = "Please wait, this process may take a few minutes..."
-                perc = (count/len(playtime_stats))*100
-                pmsg = f"{count}/{total} checks completed: {perc:.1f}% done."
-                newprogress = discord.Embed(title=prg_title, color=0xf5c242)
+            # Former members only show up with the all argument
+            rank = rank_select(member_ranks.get(player, "NOT IN GUILD"))
+            # Durations are tracked in seconds but shown in minutes
+            publishable_stats.append({"name": username, "total": total_playtime // 60, "rank": rank})
 
-                newprogress.add_field(name="Checks Completed", value=pmsg, inline=True)
-                newprogress.set_footer(text=req)
-
-                await pmessage.edit(embed=newprogress)
-                last = count
-
-        await asyncio.sleep(1)
-        await pmessage.delete()
+        await progress.finish()
 
         publishable_stats.sort(key = lambda x: x['name'])
         publishable_stats.sort(key = lambda x: x["total"], reverse=True)
         publishable_stats.sort(key = lambda x: x["rank"])
 
-        if not publishable_stats:
-            error_embed_dict = {
-                "title": "Error - Playtime",
-                "footer": {
-                    "text": requester
-                },
-                "color": ERROR_HEX,
-                "fields": [
-                    {
-                        "name": "No Data Found",
-                        "value": "No playtime information was found during this period."
-                    }
-                ]
-            }
+        return publishable_stats
 
-            await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
+    @playtime.autocomplete("guild")
+    async def playtime_guild_autocomplete(self, interaction: discord.Interaction, current: str):
+        # Only the tracked guilds have playtime data
+        current = current.lower()
+        options = [name for name in guilds_to_check if current in name.lower() or current in guilds_to_check[name][1].lower()]
+        return [discord.app_commands.Choice(name=f"{name} [{guilds_to_check[name][1]}]", value=name) for name in options[:25]]
+
+    @commands.hybrid_command(name="activity")
+    async def activity(self, ctx: commands.Context, *, guild: str):
+        """Displays how long ago each member of a guild last joined. (.activity <guild> or /activity <guild>)"""
+
+        if ctx.interaction:
+            await ctx.interaction.response.defer(ephemeral=True)
+        else:
+            try:
+                await ctx.message.delete()
+            except:
+                pass
+        requester = f"Requested by {ctx.author.name}."
+
+        guild_list_cog = self.bot.get_cog("GuildListUpdater")
+        if guild_list_cog:
+            # The guild index is used to resolve the input, give its warm-up a moment to finish
+            await guild_list_cog.warmup.wait()
+
+        # Names and prefixes are resolved locally, the raw input is sent upstream when nothing matches
+        # since guilds made or renamed after the last index rebuild aren't in it yet
+        candidates = guild_search.resolve(guild) if len(guild_index) else []
+
+        if not candidates:
+            # Close names are only offered if the guild isn't found upstream either
+            await self.send_activity(ctx, guild, requester, suggestions=guild_search.fuzzy(guild, limit=5))
             return
 
-        #send message
-        embed = discord.Embed(title=title, color=SUCCESS_HEX)
+        if len(candidates) == 1:
+            await self.send_activity(ctx, candidates[0], requester)
+            return
 
-        allstring = "".join(str(val) for val in [[player[a] for a in player] for player in publishable_stats])
-        subtotallen = 0
-        totallen = len(allstring + " " * 6 * len(publishable_stats))
-        if totallen > EMBED_LIMIT:
-            secembed = discord.Embed(title=f"{title} (cont.)", color=SUCCESS_HEX)
-            cleared = False
+        guild_options = "\n".join(f"- {name} [{guild_index.prefix_of(name)}]" for name in candidates)
+        error_embed_dict = {
+            "title": "Error - Guild Activity",
+            "footer": {
+                "text": requester
+            },
+            "color": ERROR_HEX,
+            "fields": [
+                {
+                    "name": "Multiple Guilds Found",
+                    "value": f"Several guilds match \"{guild}\", please try again with one of:\n{guild_options}"
+                }
+            ]
+        }
+        await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
 
-        output = {"rank":"","text":""}
+    @activity.autocomplete("guild")
+    async def activity_guild_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [discord.app_commands.Choice(name=name, value=name) for name in guild_search.suggest(current)]
 
-        for player in publishable_stats:
-            storedrank = player["rank"]
-            rank = rank_select(storedrank)
-            playtime = player["total"]
-            if len(str(playtime)) > 3:
-                playtime = '{:,}'.format(playtime).replace(","," ")
-            statement = f"\n{player['name']} : {playtime} minutes"
-            if subtotallen > EMBED_LIMIT:
-                if not cleared:
-                    if output["text"]:
-                        output["text"] = discord.utils.escape_markdown(output["text"])
-                        embed.add_field(name=output["rank"],value=output["text"],inline=False)
-                    subtotallen += len(output["text"])
-                    output = {"rank":rank,"text":""}
-                    cleared = True
-
-                if output["rank"] == rank: #same or lower rank
-                    if len(output["text"]) < 950:
-                        output["text"] += statement
-                    else: #full
-                        if output["text"]:
-                            output["text"] = discord.utils.escape_markdown(output["text"])
-                            secembed.add_field(name=output["rank"],value=output["text"],inline=False)
-                        subtotallen += len(output["text"])
-                        output = {"rank":rank,"text":""}
-                        output["text"] += statement
-                else: #was higher rank
-                    if output["text"]:
-                        output["text"] = discord.utils.escape_markdown(output["text"])
-                        secembed.add_field(name=output["rank"],value=output["text"],inline=False)
-                    subtotallen += len(output["text"])
-                    output = {"rank":rank,"text":""}
-                    output["text"] += statement
-            else:
-                if output["rank"] == rank: #same or lower rank
-                    if len(output["text"]) < 950:
-                        output["text"] += statement
-                    else: #full
-                        if output["text"]:
-                            output["text"] = discord.utils.escape_markdown(output["text"])
-                            embed.add_field(name=output["rank"],value=output["text"],inline=False)
-                        subtotallen += len(output["text"])
-                        output = {"rank":rank,"text":""}
-                        output["text"] += statement
-                else: #was higher rank
-                    if output["text"]:
-                        output["text"] = discord.utils.escape_markdown(output["text"])
-                        embed.add_field(name=output["rank"],value=output["text"],inline=False)
-                    subtotallen += len(output["text"])
-                    output = {"rank":rank,"text":""}
-                    output["text"] += statement
-
-        output["text"] = discord.utils.escape_markdown(output["text"])
-
-        if subtotallen > EMBED_LIMIT:
-            secembed.add_field(name=output["rank"], value=output["text"], inline=False)
-        else:
-            embed.add_field(name=output["rank"], value=output["text"], inline=False)
+    async def fetch_last_join(self, member, limiter):
+        # Returns (member, last join as a utc datetime), None when the lookup failed
+        uuid = member["uuid"]
 
-        embed.set_footer(text=requester)
+        # Players the tracker has seen online are answered without asking the API
+        seen = last_seen.get(uuid=uuid, name=member["name"])
+        if seen is not None:
+            return member, datetime.utcfromtimestamp(seen * 60)
 
-        if subtotallen <= EMBED_LIMIT:
-            await ctx.send(embed=embed)
-        else:
-            secembed.set_footer(text=requester)
-            await ctx.send(embeds=[embed, secembed])
-
-    # @commands.hybrid_command(name="activity")
-    # async def new_activity(self, ctx: commands.Context, *guild: str):
-    #     """Displays the activity for the inputted guild. (.activity <guild> or /activity guild)"""
-
-    #     if ctx.interaction:
-    #         await ctx.interaction.response.defer(ephemeral=True)
-    #     requester = f"Requested by {ctx.author.name}."
-        
-    #     guild_list = cogs.wynn_guildlist.guild_list
-    #     guild_search = " ".join(guild)
-
-    @commands.command()
-    async def activity(self, ctx, *guildcheck):
-        try:
-            await ctx.message.delete()
-        except:
-            pass
+        cached = self.last_joins.get(uuid)
+        if cached and time.time() - cached[1] < LAST_JOIN_TTL:
+            return member, cached[0]
 
-        req = f"Requested by {ctx.author.name}."
+        async with limiter:
+            try:
+                memberinfo = (await http_client.get_json(f"{WYNN_PLAYER_STATS_URL}/{uuid}/stats", params=wynn_headers, limiter=wynn_limiter, priority=INTERACTIVE)).data
+                joingrab = memberinfo["data"][0]["meta"]["lastJoin"]
+                lastjoin = datetime.strptime(joingrab.split("T")[0], "%Y-%m-%d")
+            except (http_client.RequestFailed, KeyError, IndexError, TypeError, ValueError):
+                return member, None
 
-        guildlst = global_vars.guild_list
-        guildsearch = " ".join(guildcheck)
-        srvtrack = global_vars.srvtrack
+        self.last_joins[uuid] = (lastjoin, time.time())
+        return member, lastjoin
 
+    async def send_activity(self, ctx, guildsearched, requester, suggestions=None):
         try:
-            guildstats = requests.get(f"https://api.wynncraft.com/public_api.php?action=guildStats&command={guildsearch}", params=wynn_headers).json()
-
-            members = guildstats["members"]
+            request = await http_client.get_json(f"{WYNN_GUILD_STATS_URL}&command={guildsearched}", params=wynn_headers, limiter=wynn_limiter, priority=INTERACTIVE)
+            members = request.data["members"]
+            # Keeps guilds found upstream resolvable locally until the next index rebuild
+            guild_index.add(request.data["name"], request.data["prefix"])
+        except (http_client.RequestFailed, KeyError, TypeError):
+            error_value = f"No guilds were found with the name/prefix: \"{guildsearched}\"."
+            if suggestions:
+                guild_options = "\n".join(f"- {name} [{guild_index.prefix_of(name)}]" for name in suggestions)
+                error_value += f" Did you mean:\n{guild_options}"
+            error_embed_dict = {
+                "title": "Error - Guild Activity",
+                "footer": {
+                    "text": requester
+                },
+                "color": ERROR_HEX,
+                "fields": [
+                    {
+                        "name": "Guild Not Found",
+                        "value": error_value
+                    }
+                ]
+            }
+            await ctx.send(embed=discord.Embed.from_dict(error_embed_dict))
+            return
 
-            total = len(members)
-            count = 0
+        total = len(members)
+        count = 0
 
-            req = "Please wait, this process may take a few minutes..."
-            pmsg = f"0/{total} checks completed: 0.0% done."
-            title = f"Guild Activity Progress - {guildsearch}"
-            progress = discord.Embed(title=title, color=0xf5c242)
+        progress = await ProgressReporter(f"Guild Activity Progress - {guildsearched}", total).start(ctx.send)
 
-            progress.add_field(name="Checks Completed", value=pmsg, inline=True)
-            progress.set_footer(text=req)
+        memberslst = []
 
-            pmessage = await ctx.send(embed=progress)
+        rankselection = {"OWNER":1,"CHIEF":2,"STRATEGIST":3,"CAPTAIN":4,"RECRUITER":5,"RECRUIT":6}
 
-            memberslst = []
-            last = 0
+        now = time.time()
+        self.last_joins = {uuid: cached for uuid, cached in self.last_joins.items() if now - cached[1] < LAST_JOIN_TTL}
 
-            rankselection = {"OWNER":1,"CHIEF":2,"STRATEGIST":3,"CAPTAIN":4,"RECRUITER":5,"RECRUIT":6}
-            revrankselection = {1:"OWNER",2:"CHIEF",3:"STRATEGIST",4:"CAPTAIN",5:"RECRUITER",6:"RECRUIT"}
+        # Members are looked up concurrently, the shared rate limit keeps the overall pace
+        limiter = asyncio.Semaphore(ACTIVITY_CONCURRENCY)
+        lookups = [self.fetch_last_join(member, limiter) for member in members]
 
-            for member in members:
-                #member add
-                username = member["name"]
-                rank = member["rank"]
-                uuid = member["uuid"]
+        for lookup in asyncio.as_completed(lookups):
+            member, lastjoin = await lookup
+            count += 1
+            progress.update(count)
 
-                memberinfo = requests.get(f"https://api.wynncraft.com/v2/player/{uuid}/stats", params=wynn_headers).json()
-                joingrab = memberinfo["data"][0]["meta"]["lastJoin"]
-                lastjoin = joingrab.split("T")
-                lastjoinobj = datetime.strptime(lastjoin[0], "%Y-%m-%d")
-                currenttime = datetime.utcnow()
-                indays = (currenttime - lastjoinobj).days
+            if lastjoin:
+                indays = (datetime.utcnow().date() - lastjoin.date()).days
 
-                member_data = {"username":username,"rank":rankselection[rank],"daysdif":indays}
+                username = resolver.cached_name(member["uuid"]) or member["name"]
+                member_data = {"username":username,"rank":rankselection[member["rank"]],"daysdif":indays}
                 memberslst.append(member_data)
 
-                count += 1
-
-                if (count == last + 20) or (count + 3 > total):
-                    #embed update
-                    req = "Please wait, this process may take a few minutes..."
-                    perc = (count/total)*100
-                    pmsg = f"{count}/{total} checks completed: {perc:.1f}% done."
-                    title = f"Guild Activity Progress - {guildsearch}"
-                    newprogress = discord.Embed(title=title, color=0xf5c242)
-
-                    newprogress.add_field(name="Checks Completed", value=pmsg, inline=True)
-                    newprogress.set_footer(text=req)
-
-                    await pmessage.edit(embed=newprogress)
-                    last = count
-
-            await asyncio.sleep(1)
-            await pmessage.delete()
-
-            memberslst.sort(key = lambda x: x['username'])
-            memberslst.sort(key = lambda x: x["daysdif"],reverse=True)
-            memberslst.sort(key = lambda x: x["rank"])
-
-            title = f"Guild Activity - {guildsearch}"
-            #send message
-            embed = discord.Embed(title=title, color=0x6edd67)
-
-            output = {"rank":"","text":""}
-
-            for player in memberslst:
-                storedrank = player["rank"]
-                rank = revrankselection[storedrank]
-                if output["rank"] == rank: #same or lower rank
-                    if len(output["text"]) < 950:
-                        if player['daysdif'] == 1:
-                            output["text"] += f"\n{player['username']} : Last joined 1 day ago."
-                        else:
-                            output["text"] += f"\n{player['username']} : Last joined {player['daysdif']} days ago."
-                    else: #full
-                        if output["text"]:
-                            output["text"] = discord.utils.escape_markdown(output["text"])
-                            embed.add_field(name=output["rank"],value=output["text"],inline=False)
-                        output = {"rank":rank,"text":""}
-                        if player['daysdif'] == 1:
-                            output["text"] += f"{player['username']} : Last joined 1 day ago."
-                        else:
-                            output["text"] += f"{player['username']} : Last joined {player['daysdif']} days ago."
-                else: #was higher rank
-                    if output["text"]:
-                        output["text"] = discord.utils.escape_markdown(output["text"])
-                        embed.add_field(name=output["rank"],value=output["text"],inline=False)
-                    output = {"rank":rank,"text":""}
-                    if player['daysdif'] == 1:
-                        output["text"] += f"{player['username']} : Last joined 1 day ago."
-                    else:
-                        output["text"] += f"{player['username']} : Last joined {player['daysdif']} days ago."
-            if output["text"]:
-                output["text"] = discord.utils.escape_markdown(output["text"])
-                embed.add_field(name=output["rank"],value=output["text"],inline=False)
-
-            embed.set_footer(text=req)
-
-            await ctx.send(embed=embed)
-
-        except:
-            if guildsearch.lower() in guildlst:
-                guildsearched = guildlst[guildsearch.lower()]
-                if "|" in guildsearched:
-                    guildspot = guildsearched.split("|")
-                    gldpotlst = ""
-
-                    count = 1
-                    while count < len(guildspot):
-                        if gldpotlst == "":
-                            gldpotlst = f"{guildspot[count-1]} - {count}"
-                        else:
-                            gldpotlst += f"\n{guildspot[count-1]} - {count}"
-                        count += 1
-                    choosemessage = f'```There are multiple guilds with the prefix: "{guildsearch}". Please respond with the number corresponding to the intended guild, within the next 30 seconds. \n{gldpotlst}```'
-                    cmsg = await ctx.send(choosemessage)
-
-                    srvtrack[ctx.guild.id] = (guildspot, ctx.author.id, cmsg, "activity")
-
-                    await asyncio.sleep(30)
-                    try:
-                        await cmsg.delete()
-                        del srvtrack[ctx.guild.id]
-                    except:
-                        pass
-                else:
-                    try:
-                        guildstats = requests.get(f"https://api.wynncraft.com/public_api.php?action=guildStats&command={guildsearched}", params=wynn_headers).json()
-
-                        members = guildstats["members"]
-
-                        total = len(members)
-                        count = 0
-
-                        req = "Please wait, this process may take a few minutes..."
-                        pmsg = f"0/{total} checks completed: 0.0% done."
-                        title = f"Guild Activity Progress - {guildsearched}"
-                        progress = discord.Embed(title=title, color=0xf5c242)
-
-                        progress.add_field(name="Checks Completed", value=pmsg, inline=True)
-                        progress.set_footer(text=req)
-
-                        pmessage = await ctx.send(embed=progress)
-
-                        memberslst = []
-                        last = 0
-
-                        rankselection = {"OWNER":1,"CHIEF":2,"STRATEGIST":3,"CAPTAIN":4,"RECRUITER":5,"RECRUIT":6}
-                        revrankselection = {1:"OWNER",2:"CHIEF",3:"STRATEGIST",4:"CAPTAIN",5:"RECRUITER",6:"RECRUIT"}
-
-                        for member in members:
-                            #member add
-                            username = member["name"]
-                            rank = member["rank"]
-                            uuid = member["uuid"]
-
-                            memberinfo = requests.get(f"https://api.wynncraft.com/v2/player/{uuid}/stats", params=wynn_headers).json()
-                            joingrab = memberinfo["data"][0]["meta"]["lastJoin"]
-                            lastjoin = joingrab.split("T")
-                            lastjoinobj = datetime.strptime(lastjoin[0], "%Y-%m-%d")
-                            currenttime = datetime.utcnow()
-                            indays = (currenttime - lastjoinobj).days
-
-                            member_data = {"username":username,"rank":rankselection[rank],"daysdif":indays}
-                            memberslst.append(member_data)
-
-                            count += 1
-
-                            if (count == last + 20) or (count + 3 > total):
-                                #embed update
-                                req = "Please wait, this process may take a few minutes..."
-                                perc = (count/total)*100
-                                pmsg = f"{count}/{total} checks completed: {perc:.1f}% done."
-                                title = f"Guild Activity Progress - {guildsearched}"
-                                newprogress = discord.Embed(title=title, color=0xf5c242)
-
-                                newprogress.add_field(name="Checks Completed", value=pmsg, inline=True)
-                                newprogress.set_footer(text=req)
-
-                                await pmessage.edit(embed=newprogress)
-                                last = count
-
-                        await asyncio.sleep(1)
-                        await pmessage.delete()
-
-                        memberslst.sort(key = lambda x: x['username'])
-                        memberslst.sort(key = lambda x: x["daysdif"],reverse=True)
-                        memberslst.sort(key = lambda x: x["rank"])
-
-                        req = "Requested by " + ctx.message.author.name + "."
-
-                        title = f"Guild Activity - {guildsearched}"
-                        #send message
-                        embed = discord.Embed(title=title, color=0x6edd67)
-
-                        output = {"rank":"","text":""}
-
-                        for player in memberslst:
-                            storedrank = player["rank"]
-                            rank = revrankselection[storedrank]
-                            if output["rank"] == rank: #same or lower rank
-                                if len(output["text"]) < 950:
-                                    if player['daysdif'] == 1:
-                                        output["text"] += f"\n{player['username']} : Last joined 1 day ago."
-                                    else:
-                                        output["text"] += f"\n{player['username']} : Last joined {player['daysdif']} days ago."
-                                else: #full
-                                    if output["text"]:
-                                        output["text"] = discord.utils.escape_markdown(output["text"])
-                                        embed.add_field(name=output["rank"],value=output["text"],inline=False)
-                                    output = {"rank":rank,"text":""}
-                                    if player['daysdif'] == 1:
-                                        output["text"] += f"{player['username']} : Last joined 1 day ago."
-                                    else:
-                                        output["text"] += f"{player['username']} : Last joined {player['daysdif']} days ago."
-                            else: #was higher rank
-                                if output["text"]:
-                                    output["text"] = discord.utils.escape_markdown(output["text"])
-                                    embed.add_field(name=output["rank"],value=output["text"],inline=False)
-                                output = {"rank":rank,"text":""}
-                                if player['daysdif'] == 1:
-                                    output["text"] += f"{player['username']} : Last joined 1 day ago."
-                                else:
-                                    output["text"] += f"{player['username']} : Last joined {player['daysdif']} days ago."
-                        if output["text"]:
-                            output["text"] = discord.utils.escape_markdown(output["text"])
-                            embed.add_field(name=output["rank"],value=output["text"],inline=False)
-
-                        embed.set_footer(text=req)
-
-                        await ctx.send(embed=embed)
-                    except:
-                        pass
+        await progress.finish()
 
-            else:
-                wmsg = f'No guilds were found with the name/prefix: "{guildsearch}".'
-                warn = discord.Embed(title="Error - Guild Not Found", color=0xeb1515)
+        memberslst.sort(key = lambda x: x['username'])
+        memberslst.sort(key = lambda x: x["daysdif"],reverse=True)
+        memberslst.sort(key = lambda x: x["rank"])
 
-                warn.add_field(name="Error", value=wmsg, inline=True)
+        title = f"Guild Activity - {guildsearched}"
+        #send message
+        rows = []
+        for player in memberslst:
+            if player['daysdif'] == 1:
+                rows.append((rank_select(player["rank"]), f"{player['username']} : Last joined 1 day ago."))
+            else:
+                rows.append((rank_select(player["rank"]), f"{player['username']} : Last joined {player['daysdif']} days ago."))
 
-                req = "Requested by " + ctx.message.author.name + "."
-                warn.set_footer(text=req)
+        await send_paginated(ctx, title, rows, SUCCESS_HEX, requester)
 
-                await ctx.send(embed=warn)
-            
 async def setup(bot):
     await bot.add_cog(PlaytimeUpdater(bot))
@@ -1,4 +1,2 @@
-guild_list = {}
-srvtrack = {}
 exclusive_users = []
 dev_mode = False
@@ -14,6 +14,7 @@ import quart
 from quart import Quart
 
 import global_vars
+from utils import http_client
 
 # Bot Setup
 BASEDIR = os.path.abspath(os.path.dirname(__file__))
@@ -152,6 +153,11 @@ async def main():
             await bot.load_extension(extension)
         if not global_vars.dev_mode:
             bot.loop.create_task(app.run_task(host='0.0.0.0', port=10000))
-        await bot.start(config["DISCORD_BOT_TOKEN"])
+        try:
+            await bot.start(config["DISCORD_BOT_TOKEN"])
+        finally:
+            await http_client.close()
 
-asyncio.run(main())
+if __name__ == "__main__":
+    # Roster worker processes re-import this module, they must not start another bot
+    asyncio.run(main())
@@ -0,0 +1,42 @@
+import pytest
+
+from utils.last_seen import LastSeenIndex
+
+UUIDS = {"Alice": "0f3c5a1e-2b4d-4c6e-8a9b-1c2d3e4f5a6b", "Bob": None}
+
+def test_round_trip():
+    index = LastSeenIndex(path=None)
+    index.observe(["Alice", "Bob"], 6000, UUIDS.get)
+    index.observe(["alice"], 12060)
+
+    loaded = LastSeenIndex(path=None)
+    loaded.loads(index.dumps())
+    assert loaded.names == ["Alice", "Bob"]
+    assert loaded.get(name="ALICE") == 201
+    assert loaded.get(uuid=UUIDS["Alice"]) == 201
+    assert loaded.get(uuid="0f3c5a1e2b4d4c6e8a9b1c2d3e4f5a6b") == 201
+    assert loaded.get(name="Bob") == 100
+    assert loaded.get(name="Carol") is None
+    assert not loaded.dirty
+
+def test_empty_round_trip():
+    loaded = LastSeenIndex(path=None)
+    loaded.loads(LastSeenIndex(path=None).dumps())
+    assert len(loaded) == 0
+
+def test_rename_follows_newest_name():
+    index = LastSeenIndex(path=None)
+    uuid = "0f3c5a1e2b4d4c6e8a9b1c2d3e4f5a6b"
+    index.observe(["OldName"], 60, lambda name: uuid)
+    index.observe(["NewName"], 120, lambda name: uuid)
+
+    loaded = LastSeenIndex(path=None)
+    loaded.loads(index.dumps())
+    assert loaded.get(uuid=uuid) == 2
+    assert loaded.get(name="OldName") == 1
+
+def test_truncated_data():
+    index = LastSeenIndex(path=None)
+    index.observe(["Alice", "Bob"], 6000)
+    with pytest.raises(ValueError):
+        LastSeenIndex(path=None).loads(index.dumps()[:-3])
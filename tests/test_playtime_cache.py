@@ -0,0 +1,41 @@
+from utils.playtime_cache import PlaytimeCache
+
+KEY = ("Nia", 10, 20, False)
+
+def test_invalidated_build_is_not_stored():
+    cache = PlaytimeCache()
+    first = cache.begin(*KEY)
+    cache.invalidate_hour(15)
+    second = cache.begin(*KEY)
+
+    cache.put(*KEY, "stale", first)
+    cache.end(*KEY)
+    assert cache.get(*KEY) is None
+
+    cache.put(*KEY, "fresh", second)
+    cache.end(*KEY)
+    assert cache.get(*KEY) == "fresh"
+    assert not cache.generations and not cache.builds
+
+def test_failed_build_does_not_leak():
+    cache = PlaytimeCache()
+    cache.begin(*KEY)
+    cache.end(*KEY)
+    assert not cache.generations and not cache.builds
+
+def test_clear_rejects_builds_in_progress():
+    cache = PlaytimeCache()
+    token = cache.begin(*KEY)
+    cache.clear()
+    cache.put(*KEY, "old state", token)
+    cache.end(*KEY)
+    assert cache.get(*KEY) is None
+
+def test_unrelated_invalidation_keeps_build():
+    cache = PlaytimeCache()
+    token = cache.begin(*KEY)
+    cache.invalidate_hour(25)
+    cache.invalidate_guild("LXA")
+    cache.put(*KEY, "result", token)
+    cache.end(*KEY)
+    assert cache.get(*KEY) == "result"
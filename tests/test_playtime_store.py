@@ -0,0 +1,38 @@
+import random
+
+from utils.playtime_store import PlaytimeStore
+
+def brute_totals(store: PlaytimeStore, start_hour: int, end_hour: int):
+    totals = {}
+    for hour, records in store.range(start_hour, end_hour):
+        for record in records:
+            key = (record["uuid"].replace("-", ""), record["guild"])
+            totals[key] = totals.get(key, 0) + record["duration"]
+    return {key: duration for key, duration in totals.items() if duration}
+
+def rollup_totals(store: PlaytimeStore, start_hour: int, end_hour: int):
+    return {key: duration for key, duration in store.rollups.query(start_hour, end_hour).items() if duration}
+
+def test_prune_zero_duration_records():
+    store = PlaytimeStore()
+    store.add(100, {"uuid": "a", "duration": 0, "guild": "Nia"})
+    store.add(101, {"uuid": "a", "duration": 0, "guild": "Nia"})
+    store.prune(101)
+    store.prune(102)
+    assert store.hours == []
+    assert store.rollups.totals == {}
+
+def test_rollups_match_brute_force():
+    rng = random.Random(5)
+    store = PlaytimeStore()
+    for _ in range(2000):
+        hour = rng.randrange(0, 24 * 30)
+        store.add(hour, {"uuid": rng.choice("abcde"), "duration": rng.choice([0, 0, 60, 125, 3600]), "guild": rng.choice(["Nia", "LXA"])})
+
+    for cut in (0, 5, 24 * 3 + 7, 24 * 8, 24 * 20 + 1):
+        store.prune(cut)
+        for _ in range(50):
+            start = rng.randrange(cut, 24 * 30)
+            end = rng.randrange(start, 24 * 30 + 1)
+            assert rollup_totals(store, start, end) == brute_totals(store, start, end)
+        assert {key: value for key, value in store.rollups.totals.items() if value} == brute_totals(store, None, None)
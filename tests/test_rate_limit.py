@@ -0,0 +1,26 @@
+import asyncio
+
+from utils.rate_limit import BACKGROUND, INTERACTIVE, TokenBucket
+
+def test_small_bucket_grants_background():
+    async def run():
+        bucket = TokenBucket(6)
+        await asyncio.wait_for(bucket.acquire(BACKGROUND), 1)
+
+    asyncio.run(run())
+
+def test_reserve_fits_in_capacity():
+    for per_minute in (1, 6, 7, 7.2, 60, 180):
+        bucket = TokenBucket(per_minute)
+        assert 1 + bucket.reserve <= bucket.capacity
+        bucket.set_rate(per_minute / 13)
+        assert 1 + bucket.reserve <= bucket.capacity
+
+def test_interactive_keeps_reserve():
+    async def run():
+        bucket = TokenBucket(60)
+        for _ in range(int(bucket.capacity - bucket.reserve)):
+            await asyncio.wait_for(bucket.acquire(BACKGROUND), 1)
+        await asyncio.wait_for(bucket.acquire(INTERACTIVE), 1)
+
+    asyncio.run(run())
@@ -0,0 +1,43 @@
+import io
+
+import pytest
+
+from utils import snapshot
+
+UUID_A = "0f3c5a1e2b4d4c6e8a9b1c2d3e4f5a6b"
+UUID_B = "1a2b3c4d-5e6f-4a7b-8c9d-0e1f2a3b4c5d"
+
+HOURS = [
+    (470000, [{"uuid": UUID_A, "duration": 125, "guild": "Nia"}, {"uuid": UUID_A, "duration": 0, "guild": "LXA"}]),
+    (470001, [{"uuid": UUID_A, "duration": 3600 * 5, "guild": "Nia"}]),
+]
+DAYS = [("2023-01-02", {"Nia": [UUID_B], "LXA": []})]
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip(compress):
+    data = snapshot.dumps(hours=HOURS, days=DAYS, compress=compress)
+    entries = snapshot.loads(data)
+    assert entries == [("hour", hour, records) for hour, records in HOURS] + [("day", day, rosters) for day, rosters in DAYS]
+
+def test_round_trip_small_chunks():
+    data = snapshot.dumps(hours=HOURS, days=DAYS)
+    entries = list(snapshot.SnapshotReader(io.BytesIO(data), chunk_size=3))
+    assert [entry[1] for entry in entries] == [470000, 470001, "2023-01-02"]
+
+def test_minutes_version_is_scaled_to_seconds():
+    data = bytearray(snapshot.dumps(hours=HOURS, compress=False))
+    data[len(snapshot.MAGIC)] = snapshot.MINUTES_VERSION
+    entries = snapshot.loads(bytes(data))
+    assert [record["duration"] for _, _, records in entries for record in records] == [125 * 60, 0, 3600 * 5 * 60]
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_truncated_stream(compress):
+    data = snapshot.dumps(hours=HOURS, days=DAYS, compress=compress)
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.loads(data[:len(data) - 4])
+
+def test_bad_header():
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.loads(b"XYZ\x02\x00")
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.loads(snapshot.MAGIC + bytes([snapshot.VERSION + 1, 0]))
@@ -0,0 +1,407 @@
+# Imports
+import ast
+import asyncio
+import base64
+import json
+import os
+import time
+import traceback
+from datetime import datetime, timedelta
+
+import github
+from dotenv import dotenv_values
+from pytz import timezone
+from github import Github
+from urllib3 import Retry
+from bitdotio import bitdotio
+
+from utils import http_client, rate_limit
+from utils.last_seen import last_seen
+from utils.name_resolver import resolver
+from utils.playtime_store import HOUR, PlaytimeStore, epoch_hour
+from utils.members_store import DAY_FORMAT, MembersStore
+from utils.data_repo import DataRepo
+from utils.roster_diff import RosterDiff
+from utils.roster_workers import RosterWorkers, fetch_rosters
+from utils.session_log import SessionLog
+from utils.sql_sink import SqlSink, sqlite_cursor
+from utils.poll_scheduler import PollScheduler
+from utils.warmup import Warmup
+
+# Tracker Setup
+BASEDIR = os.path.abspath(os.path.dirname(__file__))
+ENV_POS = os.path.join(BASEDIR, '.env')
+
+config = {
+    **dotenv_values(ENV_POS),
+    **os.environ,
+}
+
+USER_KEY = config["PASTEE_USER_KEY"]
+WYNN_TOKEN = config["WYNNCRAFT_API_TOKEN"]
+TIMEZONE = timezone(config["BOT_TIMEZONE"])
+GITHUB_PAT = config["GITHUB_PACKWATCHERBOT_TOKEN"]
+BITIO_EDIT = config["BITIO_EDIT"]
+BITIO_DATABASE = config.get("BITIO_DATABASE", "PackWatcher/data")
+SQLITE_PATH = config.get("SQLITE_PATH")
+
+PASTEE_BASE_URL = "https://api.paste.ee/v1/pastes"
+WYNN_BASE_URL = "https://api.wynncraft.com/public_api.php"
+WYNN_ONLINE_PLAYERS_URL = f"{WYNN_BASE_URL}?action=onlinePlayers"
+WYNN_GUILD_STATS_URL = f"{WYNN_BASE_URL}?action=guildStats"
+
+PASTE_NAME = "Guild Playtime Change Data"
+PLAYTIME_GIT = "playtime.txt"
+MEMBERS_GIT = "members.txt"
+RETENTION_DAYS = 62
+ROSTER_CONCURRENCY = int(config.get("ROSTER_CONCURRENCY", 8))
+ROSTER_DEADLINE = float(config.get("ROSTER_DEADLINE", 30))
+WYNN_RATE_LIMIT = float(config.get("WYNN_RATE_LIMIT", 180))
+POLL_INTERVAL = float(config.get("POLL_INTERVAL", 20))
+MAX_POLL_INTERVAL = float(config.get("MAX_POLL_INTERVAL", 300))
+# Roster fetching is spread over this many processes, 0 keeps it in the tracking process
+TRACKER_WORKERS = int(config.get("TRACKER_WORKERS", 0))
+# Share of WYNN_RATE_LIMIT handed to the workers, it is taken out of this process's bucket
+WORKER_RATE_SHARE = float(config.get("TRACKER_WORKER_RATE_SHARE", 0.5))
+ROSTER_INTERVAL = 60
+SAVE_INTERVAL = 5 * 60
+
+paste_headers = {'X-Auth-Token': USER_KEY}
+wynn_headers = {"apikey": WYNN_TOKEN}
+wynn_limiter = rate_limit.bucket_for(WYNN_TOKEN, WYNN_RATE_LIMIT)
+
+#github repo setup
+retry_obj = Retry(total = 10, status_forcelist = (500, 502, 504), backoff_factor = 0.3)
+git = Github(GITHUB_PAT, retry = retry_obj)
+data_repo = DataRepo(lambda: git.get_user().get_repo("packwatcher-data"))
+
+bitio = bitdotio(BITIO_EDIT)
+
+if SQLITE_PATH:
+    # Local runs write to a SQLite file instead of bit.io
+    sql_sink = SqlSink(lambda: sqlite_cursor(SQLITE_PATH), placeholder="?")
+else:
+    sql_sink = SqlSink(lambda: bitio.pooled_cursor(BITIO_DATABASE))
+
+guilds_to_check = json.loads(config["GUILDS"])
+
+async def get_key(title):
+    request = await http_client.get_json(PASTEE_BASE_URL, headers=paste_headers)
+    paste_lst = request.data
+    for paste in paste_lst["data"]:
+        if paste["description"] == title:
+            return paste["id"]
+
+    payload = {"description": title, "expiration": "31536000", "sections": [{"contents": str({})}]}
+    send = await http_client.post_json(PASTEE_BASE_URL, payload, headers=paste_headers)
+    return send.data["id"]
+
+async def paste_fetch(title):
+    key = await get_key(title)
+
+    request = await http_client.get_json(f"{PASTEE_BASE_URL}/{key}", headers=paste_headers)
+    loaded = request.data
+    data = loaded["paste"]["sections"][0]["contents"]
+    try:
+        data = json.loads(data)
+    except json.decoder.JSONDecodeError:
+        data = ast.literal_eval(data)
+    return data
+
+def get_repo_data(filename):
+    repo = data_repo.repo
+    try:
+        data = repo.get_contents(filename).decoded_content.decode().replace("'","\"")
+        return (repo.get_contents(filename), json.loads(data))
+    except AssertionError:
+        ref = repo.get_git_ref("heads/main")
+        tree = repo.get_git_tree(ref.object.sha, recursive='/' in filename).tree
+        sha = [x.sha for x in tree if x.path == filename]
+        if not sha:
+            file = repo.create_file(filename, "Automated Data Generation","{}")["content"]
+            return(file, {})
+        data = base64.b64decode(repo.get_git_blob(sha[0]).content).decode().replace("'","\"")
+        return (repo.get_git_blob(sha[0]), json.loads(data))
+
+def load_history():
+    since_day = (datetime.now(TIMEZONE) - timedelta(days=RETENTION_DAYS)).strftime(DAY_FORMAT)
+    playtime, members, sharded = data_repo.load(since_day)
+
+    if not sharded:
+        # One-time migration from the single file history, written out as shards on the next save
+        playtime = PlaytimeStore.from_dict(get_repo_data(PLAYTIME_GIT)[1], TIMEZONE)
+        members = MembersStore.from_dict(get_repo_data(MEMBERS_GIT)[1])
+        playtime.dirty = set(playtime.hours)
+        members.dirty = set(members.day_keys)
+
+    return playtime, members
+
+def prefix_to_name(prefix: str):
+    for guild in guilds_to_check:
+        if prefix == guilds_to_check[guild][1]:
+            return guild
+    return None
+
+class Tracker:
+    # Online sessions, guild rosters and their history. Runs inside the playtime cog, or in its own
+    # process through tracker_daemon.py with the bot only reading what it publishes.
+    def __init__(self, playtime_cache=None):
+        self.stored_playtime = PlaytimeStore()
+        self.stored_hour = -1
+        self.stored_day = -1
+        self.daily_members = {}
+        self.guild_players = {}
+        self.session_log = SessionLog()
+        self.stored_changing = self.session_log.replay()
+        self.backup_version = self.session_log.version
+        self.backup_task = None
+        self.stored_members = MembersStore()
+        self.next_save = 0
+        self.roster_refreshed = None
+        self.poll_scheduler = PollScheduler(POLL_INTERVAL, max_interval=MAX_POLL_INTERVAL)
+        self.roster_diff = RosterDiff()
+        self.roster_workers = None
+        if TRACKER_WORKERS > 0:
+            self.roster_workers = RosterWorkers(TRACKER_WORKERS, WYNN_GUILD_STATS_URL, wynn_headers, WYNN_RATE_LIMIT * WORKER_RATE_SHARE, ROSTER_CONCURRENCY, ROSTER_DEADLINE)
+        # Leaderboard cache of the front-end sharing this process, if any
+        self.playtime_cache = playtime_cache
+        self.warmup = Warmup("playtime")
+
+    async def start_workers(self):
+        if self.roster_workers:
+            # The key's budget is split, so the workers and this process together stay within the limit
+            wynn_limiter.set_rate(WYNN_RATE_LIMIT * (1 - WORKER_RATE_SHARE))
+            await asyncio.get_event_loop().run_in_executor(None, self.roster_workers.start, list(guilds_to_check))
+
+    async def warm_up(self):
+        loop = asyncio.get_event_loop()
+        self.stored_playtime, self.stored_members = await loop.run_in_executor(None, load_history)
+        # Sessions which ended after the last push are only in the local log
+        for hour, record in self.session_log.records:
+            self.stored_playtime.add(hour, record)
+        await loop.run_in_executor(None, last_seen.load)
+
+        try:
+            if not self.session_log.found:
+                # No local log yet, seed it once from the remote backup
+                self.session_log.load(await paste_fetch(PASTE_NAME))
+        except:
+            pass
+
+    async def close(self):
+        self.warmup.cancel()
+        if self.roster_workers and self.roster_workers.processes:
+            await asyncio.get_event_loop().run_in_executor(None, self.roster_workers.stop)
+            wynn_limiter.set_rate(WYNN_RATE_LIMIT)
+        if self.warmup.ready:
+            try:
+                await self.save_history()
+            except Exception:
+                # Unpushed records stay in the session log and are pushed after the restart
+                traceback.print_exc()
+        self.session_log.sync()
+        self.session_log.close()
+        resolver.save()
+        last_seen.save()
+        # Rows still buffered for the current hour are written before shutting down
+        await asyncio.get_event_loop().run_in_executor(None, sql_sink.flush)
+
+    async def update(self):
+        # Removes data more than two months in the past, older shards are simply not loaded again
+        retention_hour = epoch_hour(datetime.now(TIMEZONE) - timedelta(days=RETENTION_DAYS))
+        if self.stored_playtime.prune(retention_hour) and self.playtime_cache is not None:
+            self.playtime_cache.invalidate_before(retention_hour)
+
+        self.stored_members.prune((datetime.now(TIMEZONE) - timedelta(days=RETENTION_DAYS)).strftime(DAY_FORMAT))
+
+        all_players = set()
+
+        #gets set of all players online, timing the request so slow responses back the polling off
+        self.poll_scheduler.start()
+        try:
+            request = await http_client.get_json(WYNN_ONLINE_PLAYERS_URL, params=wynn_headers, limiter=wynn_limiter)
+        except http_client.RequestFailed:
+            self.poll_scheduler.finish(ok=False)
+            return
+        self.poll_scheduler.finish(ok=request.status == 200, elapsed=request.elapsed, budget_low=wynn_limiter.low)
+
+        if request.status != 200:
+            return
+        # Joins and leaves are stamped with the time this snapshot was observed
+        observed = int(time.time())
+        online_players = request.data
+        for world in online_players:
+            if world != "request":
+                all_players.update(online_players[world])
+
+        # Everyone online is recorded, not just tracked guild members, so lookups can be answered locally
+        last_seen.observe(all_players, observed, resolver.cached_uuid)
+
+        #gets current time
+        now_time = datetime.now(TIMEZONE)
+        text_day = now_time.strftime(DAY_FORMAT)
+
+        # Rosters change far less often than the online list, so they are refreshed on their own interval
+        if self.roster_refreshed is None or time.monotonic() - self.roster_refreshed >= ROSTER_INTERVAL:
+            guild_players, guild_players_id = await self.get_guild_members(guilds_to_check)
+            self.roster_refreshed = time.monotonic()
+            # Compared against the last fetched rosters, the latest stored day is the baseline after a restart
+            if self.stored_members.day_keys:
+                self.roster_diff.seed(self.stored_members[self.stored_members.day_keys[-1]])
+            self.roster_diff.update(guild_players_id)
+        else:
+            guild_players, guild_players_id = self.guild_players, self.daily_members
+        member_guilds = {player: prefix for prefix, players in guild_players.items() for player in players}
+
+        # Open sessions are the previous snapshot of tracked players, so joins and leaves are set differences
+        tracked_online = all_players.intersection(member_guilds)
+        joined = tracked_online - self.stored_changing.keys()
+        left = self.stored_changing.keys() - all_players
+
+        for player in joined:
+            self.session_log.start(player, observed)
+
+        for prefix, uuids in guild_players_id.items():
+            if self.daily_members.get(prefix) != uuids and self.playtime_cache is not None:
+                self.playtime_cache.invalidate_guild(prefix)
+
+        self.stored_members.set(text_day, guild_players_id)
+        self.daily_members = guild_players_id
+
+        to_clear = await self.update_stored_data(left, member_guilds, now_time, observed)
+
+        for player in (to_clear):
+            self.session_log.end(player, observed)
+
+        self.session_log.sync()
+        resolver.save()
+
+        if time.time() >= self.next_save:
+
+            self.next_save = time.time() + SAVE_INTERVAL
+            last_seen.save()
+
+            # Remote backup of open sessions runs in the background, the local log is authoritative
+            if self.session_log.version != self.backup_version and (self.backup_task is None or self.backup_task.done()):
+                self.backup_task = asyncio.ensure_future(self.backup_sessions(dict(self.stored_changing), self.session_log.version))
+
+            try:
+                await self.save_history()
+            except github.GithubException:
+                pass
+
+    async def save_history(self):
+        # Stores track their own mutations, so only changed day shards are pushed. The logged records
+        # of ended sessions are dropped from the session log once they are in the data repository.
+        if not (self.stored_playtime.dirty or self.stored_members.dirty):
+            return
+        pushed = len(self.session_log.records)
+        await asyncio.get_event_loop().run_in_executor(None, data_repo.save, self.stored_playtime, self.stored_members)
+        self.session_log.settle(pushed)
+
+    async def backup_sessions(self, sessions, version):
+        try:
+            ckey = await get_key(PASTE_NAME)
+            await http_client.delete(f"{PASTEE_BASE_URL}/{ckey}", headers=paste_headers)
+
+            changing_payload = {
+                "description": PASTE_NAME,
+                "expiration": "31536000",
+                "sections": [
+                    {"contents": json.dumps(sessions)}
+                ]
+            }
+            await http_client.post_json(PASTEE_BASE_URL, changing_payload, headers=paste_headers)
+        except http_client.RequestFailed:
+            return
+        self.backup_version = version
+
+    async def current_names(self, names, uuids, limiter):
+        async def current_name(uuid):
+            cached = resolver.cached(uuid)
+            if cached is not False:
+                return cached[1] if cached else None
+            async with limiter:
+                return await resolver.get_name(uuid)
+
+        # Roster names can be stale, so resolved usernames are tracked as well
+        names = set(names)
+        usernames = await asyncio.gather(*(current_name(uuid) for uuid in uuids), return_exceptions=True)
+        names.update(username for username in usernames if isinstance(username, str))
+        return names
+
+    async def get_guild_members(self, guild_names):
+        guild_players = {}
+        guild_players_id = {}
+
+        limiter = asyncio.Semaphore(ROSTER_CONCURRENCY)
+        deadline = time.monotonic() + ROSTER_DEADLINE
+        if self.roster_workers:
+            rosters = await self.roster_workers.refresh(ROSTER_DEADLINE)
+        else:
+            rosters = await fetch_rosters(guild_names, WYNN_GUILD_STATS_URL, wynn_headers, wynn_limiter, limiter, ROSTER_DEADLINE)
+
+        # Name lookups share the roster deadline, rosters whose lookups miss it use the listed names
+        # and the cache warms up over the following refreshes
+        fetched = [rosters[guild] for guild in guild_names if guild in rosters]
+        lookups = [asyncio.ensure_future(self.current_names(names, uuids, limiter)) for _, names, uuids in fetched]
+        if lookups:
+            _, pending = await asyncio.wait(lookups, timeout=max(0, deadline - time.monotonic()))
+            for task in pending:
+                task.cancel()
+
+        for (prefix, names, uuids), lookup in zip(fetched, lookups):
+            resolved = lookup.done() and not lookup.cancelled() and not lookup.exception()
+            guild_players[prefix] = lookup.result() if resolved else set(names)
+            guild_players_id[prefix] = uuids
+
+        for guild in guild_names:
+            if guild in rosters:
+                continue
+            # Guilds which failed or missed the deadline keep their last known roster
+            prefix = guild_names[guild][1]
+            if prefix in self.guild_players and prefix in self.daily_members:
+                guild_players[prefix] = self.guild_players[prefix]
+                guild_players_id[prefix] = self.daily_members[prefix]
+
+        self.guild_players = guild_players
+        return guild_players, guild_players_id
+
+    async def update_stored_data(self, left, member_guilds, now_time, observed):
+        loop = asyncio.get_event_loop()
+        to_clear = []
+        hour = epoch_hour(now_time)
+
+        # New hour so the rows buffered over the last hour are written out,
+        # after an outage the retries don't wait for the next hour
+        if self.stored_hour != hour or sql_sink.failures:
+            self.stored_hour = hour
+            if sql_sink.due():
+                await loop.run_in_executor(None, sql_sink.flush)
+
+        day = now_time.date()
+        if self.stored_day != day and self.daily_members:
+            self.stored_day = day
+            day_start = now_time.replace(hour=0, minute=0, second=0, microsecond=0)
+            sql_sink.add_members(int(day_start.timestamp()), self.daily_members)
+
+        for player in left:
+            try:
+                uuid = await resolver.get_uuid(player)
+            except http_client.RequestFailed:
+                continue
+            if uuid:
+                prefix = member_guilds.get(player)
+                time_diff = observed - self.stored_changing[player]
+
+                if prefix:
+                    inputted_data = {"uuid": uuid, "duration": time_diff, "guild": prefix}
+                    self.stored_playtime.add(hour, inputted_data)
+                    self.session_log.record(hour, inputted_data)
+                    if self.playtime_cache is not None:
+                        self.playtime_cache.invalidate_hour(hour)
+                    sql_sink.add_playtime(hour * HOUR, [inputted_data])
+
+            to_clear.append(player)
+
+        return to_clear
@@ -0,0 +1,77 @@
+# Imports
+import asyncio
+import signal
+import time
+import traceback
+
+from tracker import Tracker
+from utils import http_client
+from utils.tracker_state import EventWriter, save_state
+
+# Published playtime is what the bot's leaderboards read, so it is kept fairly fresh
+STATE_INTERVAL = 60
+
+class TrackerDaemon:
+    # Runs the tracker on its own, independent of the bot. Playtime is published to the shared data
+    # directory and roster changes are appended to the event log for the bot to announce.
+    def __init__(self):
+        self.tracker = Tracker()
+        self.events = EventWriter()
+        self.stopping = asyncio.Event()
+        self.published_version = None
+        self.next_publish = 0
+
+    def publish_changes(self):
+        for prefix, joined, left in self.tracker.roster_diff.changes():
+            self.events.append({"type": "members", "prefix": prefix, "joined": sorted(joined), "left": sorted(left), "time": int(time.time())})
+            self.tracker.roster_diff.clear(prefix)
+        self.events.sync()
+
+    async def publish_state(self, force=False):
+        store = self.tracker.stored_playtime
+        if store.version == self.published_version or (time.time() < self.next_publish and not force):
+            return
+        self.next_publish = time.time() + STATE_INTERVAL
+        self.published_version = store.version
+        # Records are copied here so the store isn't read from another thread while it changes
+        hours = [(hour, list(records)) for hour, records in store.range()]
+        await asyncio.get_event_loop().run_in_executor(None, save_state, hours)
+
+    async def run(self):
+        loop = asyncio.get_event_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self.stopping.set)
+            except NotImplementedError:
+                pass
+
+        self.tracker.warmup.start(self.tracker.warm_up)
+        await self.tracker.warmup.event.wait()
+        await self.tracker.start_workers()
+        await self.publish_state(force=True)
+        print("Tracker started")
+
+        try:
+            while not self.stopping.is_set():
+                started = time.monotonic()
+                try:
+                    await self.tracker.update()
+                    self.publish_changes()
+                    await self.publish_state()
+                except Exception:
+                    traceback.print_exc()
+
+                # Same pacing as the cog's loop, the interval is counted from the start of a cycle
+                remaining = self.tracker.poll_scheduler.interval - (time.monotonic() - started)
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), timeout=max(0, remaining))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.tracker.close()
+            await self.publish_state(force=True)
+            self.events.close()
+            await http_client.close()
+
+if __name__ == "__main__":
+    asyncio.run(TrackerDaemon().run())
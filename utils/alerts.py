@@ -0,0 +1,108 @@
+# Imports
+import asyncio
+import time
+import traceback
+
+import discord
+
+from utils import http_client
+from utils.embed_layout import build_embed, layout_fields
+
+ALERT_HEX = 0xce34ad
+ALERT_FOOTER = "Automated Member Tracking"
+RESOLVE_CONCURRENCY = 10
+RETRY_DELAY = 30
+MAX_ATTEMPTS = 6
+
+class AlertDispatcher:
+    # Announces roster changes: names are resolved in one concurrent batch, each embed is built once
+    # and every channel gets it concurrently. Channels are separate Discord routes, so sends to one
+    # channel stay in order while discord.py handles the per-route limits. Failed sends are retried.
+    def __init__(self, bot, resolver):
+        self.bot = bot
+        self.resolver = resolver
+        self.failed = []    # [channel_id, embed, attempts, retry_at]
+
+    async def resolve_names(self, uuids):
+        limiter = asyncio.Semaphore(RESOLVE_CONCURRENCY)
+
+        async def resolve(uuid):
+            async with limiter:
+                try:
+                    return await self.resolver.resolve(uuid) or (uuid, "Unknown")
+                except http_client.RequestFailed:
+                    return (uuid, "Unknown")
+
+        return dict(zip(uuids, await asyncio.gather(*(resolve(uuid) for uuid in uuids))))
+
+    def build(self, title: str, joined, left, names: dict):
+        rows = [("New Members", "- {1} [{0}]".format(*names[uuid])) for uuid in joined]
+        rows += [("Ex-Members", "- {1} [{0}]".format(*names[uuid])) for uuid in left]
+        pages = layout_fields(rows, reserved=len(title) + len(ALERT_FOOTER) + 16)
+        return [build_embed(title, fields, ALERT_HEX, ALERT_FOOTER, page, len(pages)) for page, fields in enumerate(pages)]
+
+    async def announce(self, title: str, joined, left, channel_ids):
+        joined, left = list(joined), list(left)
+        if not joined and not left:
+            return
+        names = await self.resolve_names(list(dict.fromkeys(joined + left)))
+        embeds = self.build(title, joined, left, names)
+        await asyncio.gather(*(self.deliver(channel_id, embeds) for channel_id in channel_ids))
+
+    async def get_channel(self, channel_id: int):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            channel = await self.bot.fetch_channel(channel_id)
+        return channel
+
+    async def send(self, channel_id: int, embed: discord.Embed):
+        # Returns False when the send should be retried later
+        try:
+            channel = await self.get_channel(channel_id)
+            await channel.send(embed=embed)
+        except (discord.NotFound, discord.Forbidden):
+            # Deleted channel or missing permissions, retrying won't help
+            traceback.print_exc()
+        except (discord.HTTPException, asyncio.TimeoutError, OSError):
+            return False
+        return True
+
+    async def deliver(self, channel_id: int, embeds: list):
+        if any(entry[0] == channel_id for entry in self.failed):
+            # Earlier alerts for this channel are still waiting, queue behind them to keep the order.
+            # They go out with the channel's oldest entry, so their own retry time isn't used.
+            for embed in embeds:
+                self.failed.append([channel_id, embed, 0, time.time()])
+            return
+        for index, embed in enumerate(embeds):
+            if not await self.send(channel_id, embed):
+                # Pages after a failed one are queued too so they still arrive in order
+                for pending in embeds[index:]:
+                    self.failed.append([channel_id, pending, 1, time.time() + RETRY_DELAY])
+                return
+
+    async def retry_failed(self):
+        # Each channel's queue is retried strictly in order once its oldest entry is due
+        now = time.time()
+        by_channel = {}
+        for entry in self.failed:
+            by_channel.setdefault(entry[0], []).append(entry)
+        due = {channel_id: entries for channel_id, entries in by_channel.items() if entries[0][3] <= now}
+        if not due:
+            return
+        self.failed = [entry for entry in self.failed if entry[0] not in due]
+
+        async def retry_channel(entries):
+            for position, (channel_id, embed, attempts, _) in enumerate(entries):
+                if await self.send(channel_id, embed):
+                    continue
+                for later in entries[position:]:
+                    later[2] += 1
+                    if later[2] > MAX_ATTEMPTS:
+                        print(f"Dropping member change alert for channel {later[0]} after {MAX_ATTEMPTS} attempts")
+                        continue
+                    later[3] = time.time() + RETRY_DELAY * 2 ** (later[2] - 1)
+                    self.failed.append(later)
+                return
+
+        await asyncio.gather(*(retry_channel(entries) for entries in due.values()))
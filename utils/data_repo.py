@@ -0,0 +1,141 @@
+# Imports
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from github import InputGitTreeElement
+
+from utils import snapshot
+from utils.members_store import MembersStore
+from utils.playtime_store import LEGACY_DURATION_SCALE, PlaytimeStore
+
+PLAYTIME_DIR = "playtime"
+MEMBERS_DIR = "members"
+SHARD_FORMAT = "%Y-%m-%d"
+SHARD_EXTENSION = ".pws"
+LEGACY_EXTENSION = ".json"
+COMMIT_MESSAGE = "Automated Data Generation"
+FETCH_WORKERS = 8
+
+def shard_day(hour: int):
+    # Playtime shards are split on UTC days, members shards use the tracker's local day keys
+    return datetime.fromtimestamp(hour * 3600, timezone.utc).strftime(SHARD_FORMAT)
+
+def day_start_hour(day: str):
+    return int(datetime.strptime(day, SHARD_FORMAT).replace(tzinfo=timezone.utc).timestamp() // 3600)
+
+def encode_playtime_shard(store: PlaytimeStore, day: str):
+    start = day_start_hour(day)
+    return snapshot.dumps(hours=store.range(start, start + 24))
+
+def decode_playtime_shard(store: PlaytimeStore, content: bytes, extension: str):
+    if extension == LEGACY_EXTENSION:
+        # JSON shards predate second resolution durations
+        entries = (
+            (int(hour), [{**record, "duration": record["duration"] * LEGACY_DURATION_SCALE} for record in records])
+            for hour, records in json.loads(content).items()
+        )
+    else:
+        entries = ((hour, records) for _, hour, records in snapshot.loads(content))
+    for hour, records in entries:
+        for record in records:
+            store.add(hour, record)
+
+def encode_members_shard(store: MembersStore, day: str):
+    return snapshot.dumps(days=[(day, store[day])])
+
+def decode_members_shard(store: MembersStore, day: str, content: bytes, extension: str):
+    if extension == LEGACY_EXTENSION:
+        store.set(day, json.loads(content))
+        return
+    for _, _, rosters in snapshot.loads(content):
+        store.set(day, rosters)
+
+class DataRepo:
+    # Day sharded history in the data repository, written with one commit per save
+    def __init__(self, repo_loader, branch="main"):
+        # repo_loader is only called on first use, since fetching the repository is a network call
+        self.repo_loader = repo_loader
+        self.branch = branch
+        self._repo = None
+
+    @property
+    def repo(self):
+        if self._repo is None:
+            self._repo = self.repo_loader()
+        return self._repo
+
+    def list_shards(self):
+        # Returns {directory: {day: (blob sha, extension)}} for the current head
+        ref = self.repo.get_git_ref(f"heads/{self.branch}")
+        tree = self.repo.get_git_tree(ref.object.sha, recursive=True).tree
+
+        shards = {PLAYTIME_DIR: {}, MEMBERS_DIR: {}}
+        for element in tree:
+            directory, _, name = element.path.partition("/")
+            if directory not in shards:
+                continue
+            if name.endswith(SHARD_EXTENSION):
+                day, extension = name[:-len(SHARD_EXTENSION)], SHARD_EXTENSION
+            elif name.endswith(LEGACY_EXTENSION):
+                day, extension = name[:-len(LEGACY_EXTENSION)], LEGACY_EXTENSION
+                # Snapshot shards supersede JSON shards written before the format change
+                if day in shards[directory]:
+                    continue
+            else:
+                continue
+            shards[directory][day] = (element.sha, extension)
+        return shards
+
+    def read_blob(self, sha: str):
+        return base64.b64decode(self.repo.get_git_blob(sha).content)
+
+    def load(self, since_day: str):
+        # Only shards inside the retention window are downloaded
+        shards = self.list_shards()
+        wanted = [
+            (directory, day, sha, extension)
+            for directory, days in shards.items()
+            for day, (sha, extension) in days.items() if day >= since_day
+        ]
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            contents = list(executor.map(lambda shard: self.read_blob(shard[2]), wanted))
+
+        playtime, members = PlaytimeStore(), MembersStore()
+        for (directory, day, _, extension), content in zip(wanted, contents):
+            if directory == PLAYTIME_DIR:
+                decode_playtime_shard(playtime, content, extension)
+            else:
+                decode_members_shard(members, day, content, extension)
+        playtime.clear_dirty()
+        members.clear_dirty()
+        return playtime, members, bool(shards[PLAYTIME_DIR] or shards[MEMBERS_DIR])
+
+    def save(self, playtime: PlaytimeStore, members: MembersStore):
+        # Writes every changed day shard of both stores in a single commit
+        files = {}
+        for day in {shard_day(hour) for hour in playtime.dirty}:
+            start = day_start_hour(day)
+            if any(True for _ in playtime.range(start, start + 24)):
+                files[f"{PLAYTIME_DIR}/{day}{SHARD_EXTENSION}"] = encode_playtime_shard(playtime, day)
+        for day in members.dirty:
+            if day in members:
+                files[f"{MEMBERS_DIR}/{day}{SHARD_EXTENSION}"] = encode_members_shard(members, day)
+
+        if files:
+            self.commit(files)
+        playtime.clear_dirty()
+        members.clear_dirty()
+        return len(files)
+
+    def commit(self, files: dict):
+        ref = self.repo.get_git_ref(f"heads/{self.branch}")
+        parent = self.repo.get_git_commit(ref.object.sha)
+        elements = []
+        for path, content in files.items():
+            blob = self.repo.create_git_blob(base64.b64encode(content).decode(), "base64")
+            elements.append(InputGitTreeElement(path, "100644", "blob", sha=blob.sha))
+        tree = self.repo.create_git_tree(elements, parent.tree)
+        commit = self.repo.create_git_commit(COMMIT_MESSAGE, tree, [parent])
+        ref.edit(commit.sha)
@@ -0,0 +1,119 @@
+# Imports
+import discord
+
+# Discord embed limits
+FIELD_VALUE_LIMIT = 1024
+FIELD_NAME_LIMIT = 256
+FIELD_COUNT_LIMIT = 25
+EMBED_TOTAL_LIMIT = 6000
+
+# Pages stay well under the hard limit so a page fits on screen
+PAGE_CHAR_LIMIT = 4000
+PAGE_FIELD_LIMIT = 12
+PAGINATION_TIMEOUT = 180
+
+def layout_fields(rows, page_chars=PAGE_CHAR_LIMIT, page_fields=PAGE_FIELD_LIMIT, reserved=0):
+    # rows: ordered (section, line) pairs, e.g. (rank, "name : 120 minutes").
+    # Returns pages, each a list of (name, value) fields, in one pass over the rows. Sizes are
+    # counted on the escaped text that is actually sent, reserved covers the title and footer.
+    page_chars = min(page_chars, EMBED_TOTAL_LIMIT - reserved)
+    page_fields = min(page_fields, FIELD_COUNT_LIMIT)
+
+    pages = []
+    fields = []
+    used = 0
+    name = None
+    lines = []
+    size = 0
+
+    def close_field():
+        nonlocal fields, used
+        if not lines:
+            return
+        field_name = name[:FIELD_NAME_LIMIT]
+        cost = len(field_name) + size
+        if fields and (len(fields) >= page_fields or used + cost > page_chars):
+            pages.append(fields)
+            fields, used = [], 0
+        fields.append((field_name, "\n".join(lines)))
+        used += cost
+
+    for section, line in rows:
+        line = discord.utils.escape_markdown(line)[:FIELD_VALUE_LIMIT]
+        added = len(line) + (1 if lines else 0)
+        if section != name or size + added > FIELD_VALUE_LIMIT:
+            close_field()
+            name, lines, size = section, [], 0
+            added = len(line)
+        lines.append(line)
+        size += added
+    close_field()
+
+    if fields:
+        pages.append(fields)
+    return pages
+
+def build_embed(title: str, fields: list, color: int, footer: str, page=0, pages=1):
+    embed_dict = {
+        "title": title if pages == 1 else f"{title} ({page + 1}/{pages})",
+        "footer": {
+            "text": footer
+        },
+        "color": color,
+        "fields": [{"name": name, "value": value, "inline": False} for name, value in fields]
+    }
+    return discord.Embed.from_dict(embed_dict)
+
+class PaginatorView(discord.ui.View):
+    # Previous/next buttons for a laid out leaderboard, each page's embed is built when shown
+    def __init__(self, render, pages: int, author_id: int, timeout=PAGINATION_TIMEOUT):
+        super().__init__(timeout=timeout)
+        self.render = render
+        self.pages = pages
+        self.author_id = author_id
+        self.page = 0
+        self.message = None
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.pages - 1
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        return interaction.user.id == self.author_id
+
+    async def show(self, interaction: discord.Interaction, page: int):
+        self.page = max(0, min(page, self.pages - 1))
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.render(self.page), view=self)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page + 1)
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+async def send_paginated(ctx, title: str, rows, color: int, footer: str):
+    # Lays out the rows and sends the first page, with buttons when there is more than one
+    pages = layout_fields(rows, reserved=len(title) + len(footer) + 16)
+
+    def render(page):
+        return build_embed(title, pages[page] if pages else [], color, footer, page, max(len(pages), 1))
+
+    if len(pages) <= 1:
+        return await ctx.send(embed=render(0))
+
+    view = PaginatorView(render, len(pages), ctx.author.id)
+    view.message = await ctx.send(embed=render(0), view=view)
+    return view.message
@@ -0,0 +1,94 @@
+# Imports
+import json
+import os
+
+BASEDIR = os.path.abspath(os.path.dirname(__file__))
+INDEX_POS = os.path.join(BASEDIR, '../data/guilds.json')
+
+class GuildIndex:
+    # Guild name -> prefix, with the inverted prefix -> names index for lookups by prefix.
+    # Prefixes are kept lowercase, several guilds can share one.
+    def __init__(self, path=INDEX_POS):
+        self.path = path
+
+        self.prefixes = {}  # guild name -> prefix
+        self.names = {}     # prefix -> set of guild names
+        self.version = 0
+        self.saved_version = 0
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    def __contains__(self, name: str):
+        return name in self.prefixes
+
+    @property
+    def dirty(self):
+        return self.version != self.saved_version
+
+    def prefix_of(self, name: str):
+        return self.prefixes.get(name)
+
+    def lookup(self, prefix: str):
+        # Guild names using the prefix, sorted so choices are listed in a stable order
+        return sorted(self.names.get(prefix.lower(), ()))
+
+    def add(self, name: str, prefix: str):
+        prefix = prefix.lower()
+        if self.prefixes.get(name) == prefix:
+            return
+        self.remove(name)
+        self.prefixes[name] = prefix
+        self.names.setdefault(prefix, set()).add(name)
+        self.version += 1
+
+    def remove(self, name: str):
+        prefix = self.prefixes.pop(name, None)
+        if prefix is None:
+            return None
+        names = self.names[prefix]
+        names.discard(name)
+        if not names:
+            del self.names[prefix]
+        self.version += 1
+        return prefix
+
+    def diff(self, current: set):
+        # Returns (new, gone) against the full list of guild names from the API
+        known = self.prefixes.keys()
+        return current - known, known - current
+
+    def to_dict(self):
+        return {prefix: sorted(names) for prefix, names in self.names.items()}
+
+    def update_from(self, data: dict):
+        # Accepts both {prefix: [names]} and the old {prefix: "name|name"} paste format
+        for prefix, names in data.items():
+            if isinstance(names, str):
+                names = names.split("|")
+            for name in names:
+                self.add(name, prefix)
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+        self.update_from(data)
+        self.saved_version = self.version
+        return True
+
+    def save(self):
+        if not self.dirty:
+            return False
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file)
+        os.replace(temp_path, self.path)
+        self.saved_version = self.version
+        return True
+
+index = GuildIndex()
@@ -0,0 +1,105 @@
+# Imports
+import bisect
+
+from utils.guild_index import GuildIndex, index
+
+MIN_SIMILARITY = 0.3
+AUTOCOMPLETE_LIMIT = 25
+
+def trigrams(text: str):
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class GuildSearch:
+    # Local lookups over guild names and prefixes: exact and prefix matches through a sorted
+    # key list, typos through a trigram index. Rebuilt whenever the guild index changes.
+    def __init__(self, index: GuildIndex):
+        self.index = index
+        self.built_version = None
+
+        self.keys = []      # sorted lowercase names and prefixes
+        self.targets = {}   # lowercase key -> guild names it refers to
+        self.lower_names = {}   # lowercase name -> guild names, checked before prefixes
+        self.grams = {}     # trigram -> guild names containing it
+        self.name_grams = {}
+        self.sorted_names = []
+
+    def refresh(self):
+        if self.built_version == self.index.version:
+            return
+        targets = {}
+        lower_names = {}
+        grams = {}
+        name_grams = {}
+        for name, prefix in self.index.prefixes.items():
+            targets.setdefault(name.lower(), set()).add(name)
+            lower_names.setdefault(name.lower(), set()).add(name)
+            targets.setdefault(prefix, set()).add(name)
+            name_grams[name] = trigrams(name)
+            for gram in name_grams[name]:
+                grams.setdefault(gram, set()).add(name)
+
+        self.targets = targets
+        self.lower_names = lower_names
+        self.keys = sorted(targets)
+        self.grams = grams
+        self.name_grams = name_grams
+        self.sorted_names = sorted(name_grams, key=str.lower)
+        self.built_version = self.index.version
+
+    def exact(self, query: str):
+        # A guild named like the query wins over guilds using it as their prefix
+        self.refresh()
+        query = query.strip().lower()
+        return sorted(self.lower_names.get(query) or self.targets.get(query, ()))
+
+    def complete(self, query: str, limit=AUTOCOMPLETE_LIMIT):
+        # Guilds with a name or prefix starting with the query, shortest keys first
+        self.refresh()
+        query = query.strip().lower()
+        found = []
+        seen = set()
+        position = bisect.bisect_left(self.keys, query)
+        matches = []
+        while position < len(self.keys) and self.keys[position].startswith(query):
+            matches.append(self.keys[position])
+            position += 1
+        for key in sorted(matches, key=len):
+            for name in sorted(self.targets[key]):
+                if name not in seen:
+                    seen.add(name)
+                    found.append(name)
+            if len(found) >= limit:
+                break
+        return found[:limit]
+
+    def fuzzy(self, query: str, limit=AUTOCOMPLETE_LIMIT, min_similarity=MIN_SIMILARITY):
+        # Ranks guild names by trigram similarity to the query
+        self.refresh()
+        query_grams = trigrams(query.strip())
+        shared = {}
+        for gram in query_grams:
+            for name in self.grams.get(gram, ()):
+                shared[name] = shared.get(name, 0) + 1
+
+        scored = []
+        for name, count in shared.items():
+            score = count / (len(query_grams) + len(self.name_grams[name]) - count)
+            if score >= min_similarity:
+                scored.append((-score, name))
+        scored.sort()
+        return [name for _, name in scored[:limit]]
+
+    def resolve(self, query: str):
+        # Candidate guild names for a query: exact name/prefix, then prefix matches. Typo matches
+        # aren't taken as the guild, the query may be a guild the index doesn't have yet.
+        return self.exact(query) or self.complete(query, limit=5)
+
+    def suggest(self, query: str, limit=AUTOCOMPLETE_LIMIT):
+        # Autocomplete choices, falling back to typo matches once nothing starts with the query
+        if not query.strip():
+            self.refresh()
+            return self.sorted_names[:limit]
+        return self.complete(query, limit) or self.fuzzy(query, limit)
+
+search = GuildSearch(index)
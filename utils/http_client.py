@@ -0,0 +1,84 @@
+# Imports
+import asyncio
+import time
+
+import aiohttp
+
+from utils.rate_limit import BACKGROUND
+
+DEFAULT_TIMEOUT = 10
+CONNECTIONS_PER_HOST = 10
+KEEPALIVE_TIMEOUT = 60
+
+class RequestFailed(Exception):
+    pass
+
+class HttpResponse:
+    def __init__(self, status, data, headers, elapsed=None):
+        self.status = status
+        self.data = data
+        self.headers = headers
+        self.elapsed = elapsed  # seconds spent on the round trip, rate limit queueing not included
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+class HttpClient:
+    # One pooled session for the whole bot, connections are kept open and capped per host
+    def __init__(self, timeout=DEFAULT_TIMEOUT, limit_per_host=CONNECTIONS_PER_HOST):
+        self.timeout = timeout
+        self.limit_per_host = limit_per_host
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def request(self, method, url, *, params=None, headers=None, json=None, timeout=None, limiter=None, priority=BACKGROUND):
+        # limiter is the rate_limit bucket of the API key used, if the upstream has one
+        session = self._get_session()
+        budget = aiohttp.ClientTimeout(total=timeout or self.timeout)
+
+        if limiter:
+            await limiter.acquire(priority)
+
+        started = time.monotonic()
+        try:
+            async with session.request(method, url, params=params, headers=headers, json=json, timeout=budget) as response:
+                if limiter:
+                    limiter.update(response.status, response.headers)
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = None
+                return HttpResponse(response.status, data, response.headers, time.monotonic() - started)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            raise RequestFailed(f"{method} {url} failed: {error!r}") from error
+
+    async def get_json(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post_json(self, url, payload, **kwargs):
+        return await self.request("POST", url, json=payload, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request("DELETE", url, **kwargs)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+client = HttpClient()
+
+get_json = client.get_json
+post_json = client.post_json
+delete = client.delete
+close = client.close
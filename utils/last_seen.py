@@ -0,0 +1,120 @@
+# Imports
+import os
+import struct
+import sys
+from array import array
+
+BASEDIR = os.path.abspath(os.path.dirname(__file__))
+INDEX_POS = os.path.join(BASEDIR, '../data/last_seen.bin')
+
+# Layout: MAGIC, version byte, slot count, length prefixed "\n" joined names, then one 16 byte
+# uuid (zeroes when unknown) and one little endian uint32 epoch minute per slot.
+MAGIC = b"PWL"
+VERSION = 1
+HEADER = struct.Struct("<3sBII")
+NO_UUID = bytes(16)
+
+class LastSeenIndex:
+    # Last time every player was seen online, one slot per username with the minutes kept in an array
+    def __init__(self, path=INDEX_POS):
+        self.path = path
+
+        self.names = []             # slot -> name as last seen
+        self.slots = {}             # lowercase name -> slot
+        self.slot_uuids = {}        # slot -> uuid
+        self.uuid_slots = {}        # uuid -> most recent slot of that player
+        self.minutes = array("I")   # slot -> epoch minute last seen
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.names)
+
+    def observe(self, names, timestamp: int, uuid_of=None):
+        # uuid_of maps a name to its uuid from local data only, None when unknown
+        minute = int(timestamp // 60)
+        for name in names:
+            key = name.lower()
+            slot = self.slots.get(key)
+            if slot is None:
+                slot = len(self.names)
+                self.names.append(name)
+                self.slots[key] = slot
+                self.minutes.append(minute)
+            else:
+                self.minutes[slot] = minute
+
+            if uuid_of and slot not in self.slot_uuids:
+                uuid = uuid_of(name)
+                if uuid:
+                    self._link(slot, uuid.replace("-", ""))
+        self.dirty = True
+
+    def _link(self, slot: int, uuid: str):
+        self.slot_uuids[slot] = uuid
+        # After a rename the newest name's slot answers for the uuid
+        current = self.uuid_slots.get(uuid)
+        if current is None or self.minutes[slot] >= self.minutes[current]:
+            self.uuid_slots[uuid] = slot
+
+    def get(self, uuid=None, name=None):
+        # Epoch minute the player was last seen online, None if never seen
+        slot = self.uuid_slots.get(uuid.replace("-", "")) if uuid else None
+        if slot is None and name:
+            slot = self.slots.get(name.lower())
+        return None if slot is None else self.minutes[slot]
+
+    def dumps(self):
+        encoded_names = "\n".join(self.names).encode("utf-8")
+        uuids = b"".join(bytes.fromhex(self.slot_uuids[slot]) if slot in self.slot_uuids else NO_UUID for slot in range(len(self.names)))
+        minutes = array("I", self.minutes)
+        if sys.byteorder == "big":
+            minutes.byteswap()
+        return HEADER.pack(MAGIC, VERSION, len(self.names), len(encoded_names)) + encoded_names + uuids + minutes.tobytes()
+
+    def loads(self, data: bytes):
+        magic, version, count, names_length = HEADER.unpack_from(data)
+        if magic != MAGIC or version > VERSION:
+            raise ValueError("Not a last seen index")
+        position = HEADER.size
+        names = data[position:position + names_length].decode("utf-8").split("\n") if count else []
+        position += names_length
+        uuids = data[position:position + 16 * count]
+        position += 16 * count
+        minutes = array("I")
+        minutes.frombytes(data[position:position + 4 * count])
+        if sys.byteorder == "big":
+            minutes.byteswap()
+        if len(names) != count or len(minutes) != count:
+            raise ValueError("Truncated last seen index")
+
+        self.names = names
+        self.slots = {name.lower(): slot for slot, name in enumerate(names)}
+        self.minutes = minutes
+        self.slot_uuids = {}
+        self.uuid_slots = {}
+        for slot in range(count):
+            uuid = uuids[16 * slot:16 * slot + 16]
+            if uuid != NO_UUID:
+                self._link(slot, uuid.hex())
+        self.dirty = False
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as file:
+                self.loads(file.read())
+        except (OSError, ValueError, struct.error):
+            return False
+        return True
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self.dumps())
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+last_seen = LastSeenIndex()
@@ -0,0 +1,64 @@
+# Imports
+import bisect
+from datetime import datetime
+
+DAY_FORMAT = "%Y-%m-%d"
+LEGACY_DAY_FORMAT = "%d/%m/%y"
+
+class MembersStore:
+    # Daily guild rosters keyed by ISO date, which sorts chronologically
+    def __init__(self):
+        self.day_keys = []
+        self.days = {}
+        self.version = 0
+        self.dirty = set()
+
+    def __len__(self):
+        return len(self.day_keys)
+
+    def __contains__(self, day: str):
+        return day in self.days
+
+    def __getitem__(self, day: str):
+        return self.days[day]
+
+    def get(self, day: str, default=None):
+        return self.days.get(day, default)
+
+    def set(self, day: str, rosters: dict):
+        if self.days.get(day) == rosters:
+            return False
+        if day not in self.days:
+            bisect.insort(self.day_keys, day)
+        self.days[day] = rosters
+        self.version += 1
+        self.dirty.add(day)
+        return True
+
+    def prune(self, before_day: str):
+        cut = bisect.bisect_left(self.day_keys, before_day)
+        for day in self.day_keys[:cut]:
+            del self.days[day]
+        del self.day_keys[:cut]
+        if cut:
+            self.version += 1
+        return cut
+
+    def clear_dirty(self):
+        self.dirty = set()
+
+    def to_dict(self):
+        return {day: self.days[day] for day in self.day_keys}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        # Accepts both ISO dates and the old "%d/%m/%y" keys
+        store = cls()
+        for key, rosters in data.items():
+            try:
+                day = datetime.strptime(key, LEGACY_DAY_FORMAT).strftime(DAY_FORMAT)
+            except ValueError:
+                day = key
+            store.set(day, rosters)
+        store.clear_dirty()
+        return store
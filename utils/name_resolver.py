@@ -0,0 +1,144 @@
+# Imports
+import asyncio
+import json
+import os
+import re
+import time
+
+from utils import http_client
+
+BASEDIR = os.path.abspath(os.path.dirname(__file__))
+CACHE_POS = os.path.join(BASEDIR, '../data/names.json')
+
+MINETOOLS_UUID_API = "https://api.minetools.eu/uuid"
+
+NAME_TTL = 24 * 60 * 60
+MISSING_TTL = 60 * 60
+
+UUID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+def clean_uuid(uuid: str):
+    return uuid.replace("-", "").lower()
+
+def is_uuid(query: str):
+    return bool(UUID_PATTERN.fullmatch(clean_uuid(query)))
+
+class NameResolver:
+    # Bidirectional username <-> uuid cache, kept in memory and mirrored to disk
+    def __init__(self, path=CACHE_POS, ttl=NAME_TTL, missing_ttl=MISSING_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+
+        self.names = {}     # uuid -> [name, fetched_at]
+        self.uuids = {}     # lowercase name -> uuid
+        self.missing = {}   # lowercase name/uuid -> expiry of the negative entry
+        self.pending = {}   # lowercase query -> in-flight lookup
+        self.dirty = False
+
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        for uuid, (name, fetched_at) in data.get("names", {}).items():
+            self.names[uuid] = [name, fetched_at]
+            self.uuids[name.lower()] = uuid
+        self.missing = {key: expiry for key, expiry in data.get("missing", {}).items() if expiry > now}
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"names": self.names, "missing": self.missing}, file)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def observe(self, uuid: str, name: str, fetched_at=None):
+        uuid = clean_uuid(uuid)
+        key = name.lower()
+        fetched_at = fetched_at or time.time()
+
+        previous = self.names.get(uuid)
+        if previous and previous[0].lower() != key and self.uuids.get(previous[0].lower()) == uuid:
+            # Account was renamed, the old name no longer points here
+            del self.uuids[previous[0].lower()]
+
+        holder = self.uuids.get(key)
+        if holder and holder != uuid and holder in self.names:
+            # Name was taken over by another account, force the old holder to refresh
+            self.names[holder][1] = 0
+
+        self.names[uuid] = [name, fetched_at]
+        self.uuids[key] = uuid
+        self.missing.pop(key, None)
+        self.missing.pop(uuid, None)
+        self.dirty = True
+
+    def cached(self, query: str):
+        # Returns (uuid, name) when fresh, None when known missing, False when a lookup is needed
+        now = time.time()
+        key = clean_uuid(query) if is_uuid(query) else query.lower()
+
+        if self.missing.get(key, 0) > now:
+            return None
+
+        uuid = key if is_uuid(query) else self.uuids.get(key)
+        entry = self.names.get(uuid) if uuid else None
+        if entry and now - entry[1] < self.ttl:
+            return (uuid, entry[0])
+        return False
+
+    def cached_name(self, uuid: str):
+        entry = self.names.get(clean_uuid(uuid))
+        return entry[0] if entry else None
+
+    def cached_uuid(self, name: str):
+        return self.uuids.get(name.lower())
+
+    async def resolve(self, query: str):
+        # Raises http_client.RequestFailed when the lookup could not be completed
+        result = self.cached(query)
+        if result is not False:
+            return result
+
+        key = clean_uuid(query) if is_uuid(query) else query.lower()
+        if key not in self.pending:
+            self.pending[key] = asyncio.ensure_future(self._fetch(key))
+        try:
+            return await asyncio.shield(self.pending[key])
+        finally:
+            if key in self.pending and self.pending[key].done():
+                del self.pending[key]
+
+    async def _fetch(self, key: str):
+        request = await http_client.get_json(f"{MINETOOLS_UUID_API}/{key}")
+        if request.status != 200 or not request.data:
+            raise http_client.RequestFailed(f"Name lookup for {key} returned {request.status}")
+
+        data = request.data
+        if data.get("status") == "ERR" or not data.get("id"):
+            self.missing[key] = time.time() + self.missing_ttl
+            self.dirty = True
+            return None
+
+        self.observe(data["id"], data["name"])
+        return (clean_uuid(data["id"]), data["name"])
+
+    async def get_name(self, uuid: str):
+        result = await self.resolve(uuid)
+        return result[1] if result else None
+
+    async def get_uuid(self, name: str):
+        result = await self.resolve(name)
+        return result[0] if result else None
+
+resolver = NameResolver()
@@ -0,0 +1,75 @@
+# Imports
+import time
+from collections import OrderedDict
+
+RESULT_TTL = 60 * 60
+MAX_ENTRIES = 128
+
+class PlaytimeCache:
+    # Computed playtime leaderboards keyed by (guild prefix, start hour, end hour, members flag).
+    # Entries are dropped when a session lands inside their window, when pruning cuts into it,
+    # when the guild's roster changes, or after RESULT_TTL so rank changes show up eventually.
+    def __init__(self, ttl=RESULT_TTL, max_entries=MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()    # key -> (result, stored_at)
+        self.generations = {}           # key -> bumped by every invalidation while it's being computed
+        self.builds = {}                # key -> number of computations in progress
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, prefix: str, start_hour, end_hour, members):
+        key = (prefix, start_hour, end_hour, members)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[1] > self.ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def begin(self, prefix: str, start_hour, end_hour, members):
+        # Marks a result as being computed, the returned token is passed to put so a result which
+        # was invalidated while it was computed isn't stored. Every begin needs a matching end.
+        key = (prefix, start_hour, end_hour, members)
+        self.builds[key] = self.builds.get(key, 0) + 1
+        return self.generations.setdefault(key, 0)
+
+    def end(self, prefix: str, start_hour, end_hour, members):
+        key = (prefix, start_hour, end_hour, members)
+        self.builds[key] -= 1
+        if not self.builds[key]:
+            del self.builds[key]
+            del self.generations[key]
+
+    def put(self, prefix: str, start_hour, end_hour, members, result, token):
+        key = (prefix, start_hour, end_hour, members)
+        if self.generations.get(key) != token:
+            return
+        self.entries[key] = (result, time.time())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _drop(self, matches):
+        for key in [key for key in self.entries if matches(*key)]:
+            del self.entries[key]
+        for key in self.generations:
+            if matches(*key):
+                self.generations[key] += 1
+
+    def clear(self):
+        self._drop(lambda prefix, start, end, members: True)
+
+    def invalidate_hour(self, hour: int):
+        # A session was recorded in this hour bucket
+        self._drop(lambda prefix, start, end, members: (start is None or start <= hour) and (end is None or hour < end))
+
+    def invalidate_before(self, hour: int):
+        # Buckets before this hour were pruned
+        self._drop(lambda prefix, start, end, members: start is None or start < hour)
+
+    def invalidate_guild(self, prefix: str):
+        self._drop(lambda entry_prefix, start, end, members: entry_prefix == prefix)
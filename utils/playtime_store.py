@@ -0,0 +1,148 @@
+# Imports
+import bisect
+import math
+from datetime import datetime
+
+HOUR = 60 * 60
+LEGACY_FORMAT = "%H-%d/%m/%y"
+# Durations were stored in whole minutes before sessions were tracked to the second
+LEGACY_DURATION_SCALE = 60
+
+# Rollup spans, in hours, from coarsest to finest
+WEEK_SPAN = 24 * 7
+DAY_SPAN = 24
+HOUR_SPAN = 1
+SPANS = (WEEK_SPAN, DAY_SPAN, HOUR_SPAN)
+
+def epoch_hour(moment: datetime):
+    return int(moment.timestamp() // HOUR)
+
+def hour_bounds(start_time=None, end_time=None):
+    # Buckets starting strictly after start_time and strictly before end_time
+    start_hour = None if start_time is None else math.floor(start_time.timestamp() / HOUR) + 1
+    end_hour = None if end_time is None else math.ceil(end_time.timestamp() / HOUR)
+    return start_hour, end_hour
+
+def member_key(record: dict):
+    return (record["uuid"].replace("-", ""), record["guild"])
+
+class PlaytimeRollups:
+    # Per member totals pre-summed into hour, day and week buckets, plus an all-time total
+    def __init__(self):
+        self.levels = {span: {} for span in SPANS}
+        self.totals = {}
+
+    def add(self, hour: int, key: tuple, duration: int):
+        for span, buckets in self.levels.items():
+            bucket = buckets.setdefault(hour // span, {})
+            bucket[key] = bucket.get(key, 0) + duration
+        self.totals[key] = self.totals.get(key, 0) + duration
+
+    def remove_hour(self, hour: int):
+        removed = self.levels[HOUR_SPAN].pop(hour, {})
+        for span in (WEEK_SPAN, DAY_SPAN):
+            bucket = self.levels[span].get(hour // span)
+            if bucket is None:
+                continue
+            for key, duration in removed.items():
+                self._subtract(bucket, key, duration)
+            if not bucket:
+                del self.levels[span][hour // span]
+        for key, duration in removed.items():
+            self._subtract(self.totals, key, duration)
+
+    @staticmethod
+    def _subtract(bucket: dict, key: tuple, duration: int):
+        # Zero duration records (sub-minute legacy sessions) can leave a key already dropped
+        remaining = bucket.get(key, 0) - duration
+        if remaining > 0:
+            bucket[key] = remaining
+        else:
+            bucket.pop(key, None)
+
+    def query(self, start_hour: int, end_hour: int):
+        # Covers [start_hour, end_hour) with the fewest aligned week/day/hour buckets
+        result = {}
+        hour = start_hour
+        while hour < end_hour:
+            for span in SPANS:
+                if hour % span == 0 and hour + span <= end_hour:
+                    break
+            for key, duration in self.levels[span].get(hour // span, {}).items():
+                result[key] = result.get(key, 0) + duration
+            hour += span
+        return result
+
+class PlaytimeStore:
+    # Session records bucketed by epoch hour, with the hours kept sorted for range lookups
+    def __init__(self):
+        self.hours = []
+        self.buckets = {}
+        self.rollups = PlaytimeRollups()
+        self.version = 0
+        self.dirty = set()
+
+    def __len__(self):
+        return len(self.hours)
+
+    def add(self, hour: int, record: dict):
+        if hour not in self.buckets:
+            bisect.insort(self.hours, hour)
+            self.buckets[hour] = []
+        self.buckets[hour].append(record)
+        self.rollups.add(hour, member_key(record), record["duration"])
+        self.version += 1
+        self.dirty.add(hour)
+
+    def range(self, start_hour=None, end_hour=None):
+        # Yields (hour, records) for start_hour <= hour < end_hour, None leaves a side open
+        low = 0 if start_hour is None else bisect.bisect_left(self.hours, start_hour)
+        high = len(self.hours) if end_hour is None else bisect.bisect_left(self.hours, end_hour)
+        for hour in self.hours[low:high]:
+            yield hour, self.buckets[hour]
+
+    def between(self, start_time=None, end_time=None):
+        return self.range(*hour_bounds(start_time, end_time))
+
+    def totals(self, start_time=None, end_time=None):
+        # Returns {(uuid, guild): duration} for the window using the pre-summed rollups
+        if not self.hours:
+            return {}
+        start_hour, end_hour = hour_bounds(start_time, end_time)
+        if start_hour is None and end_hour is None:
+            return dict(self.rollups.totals)
+
+        start_hour = self.hours[0] if start_hour is None else max(start_hour, self.hours[0])
+        end_hour = self.hours[-1] + 1 if end_hour is None else min(end_hour, self.hours[-1] + 1)
+        return self.rollups.query(start_hour, end_hour)
+
+    def prune(self, before_hour: int):
+        cut = bisect.bisect_left(self.hours, before_hour)
+        for hour in self.hours[:cut]:
+            del self.buckets[hour]
+            self.rollups.remove_hour(hour)
+        del self.hours[:cut]
+        if cut:
+            self.version += 1
+        return cut
+
+    def clear_dirty(self):
+        self.dirty = set()
+
+    def to_dict(self):
+        return {str(hour): self.buckets[hour] for hour in self.hours}
+
+    @classmethod
+    def from_dict(cls, data: dict, timezone):
+        # Reads the old single file history: epoch hour or "%H-%d/%m/%y" keys (local to timezone)
+        # with durations in minutes
+        store = cls()
+        for key, records in data.items():
+            if key.isdigit():
+                hour = int(key)
+            else:
+                hour = epoch_hour(timezone.localize(datetime.strptime(key, LEGACY_FORMAT)))
+            for record in records:
+                store.add(hour, {**record, "duration": record["duration"] * LEGACY_DURATION_SCALE})
+        store.clear_dirty()
+        return store
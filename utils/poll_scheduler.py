@@ -0,0 +1,37 @@
+# Imports
+import time
+
+SLOW_AFTER = 5
+MAX_INTERVAL = 300
+BACKOFF = 2
+RECOVERY = 0.75
+
+class PollScheduler:
+    # Picks the delay between polls, backing off while the API is slow or failing and
+    # easing back towards the configured interval once responses are quick again
+    def __init__(self, interval: float, max_interval=MAX_INTERVAL, slow_after=SLOW_AFTER):
+        self.base_interval = interval
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.slow_after = slow_after
+        self.started = None
+        self.last_elapsed = None
+
+    def start(self):
+        self.started = time.monotonic()
+        return self.started
+
+    def finish(self, ok=True, elapsed=None, budget_low=False):
+        # Called once the poll's response arrived (or failed), returns the next interval. elapsed is
+        # the request's own round trip when known, so time queued behind the rate limit isn't counted.
+        # While the request budget is low the interval is held rather than sped back up.
+        self.last_elapsed = time.monotonic() - self.started if elapsed is None else elapsed
+        if not ok or self.last_elapsed > self.slow_after:
+            self.interval = min(self.interval * BACKOFF, self.max_interval)
+        elif not budget_low:
+            self.interval = max(self.base_interval, self.interval * RECOVERY)
+        return self.interval
+
+    @property
+    def backed_off(self):
+        return self.interval > self.base_interval
@@ -0,0 +1,72 @@
+# Imports
+import asyncio
+
+import discord
+
+PROGRESS_INTERVAL = 2
+PROGRESS_HEX = 0xf5c242
+PROGRESS_FOOTER = "Please wait, this process may take a few minutes..."
+
+class ProgressReporter:
+    # Keeps a progress message up to date from its own task. update() only records the latest
+    # count, the message is edited at most once per interval with whatever is newest by then.
+    def __init__(self, title: str, total: int, interval=PROGRESS_INTERVAL):
+        self.title = title
+        self.total = total
+        self.interval = interval
+
+        self.count = 0
+        self.shown = None
+        self.message = None
+        self.changed = asyncio.Event()
+        self.task = None
+
+    def embed(self):
+        percent = (self.count / self.total) * 100 if self.total else 100.0
+        embed_dict = {
+            "title": self.title,
+            "footer": {
+                "text": PROGRESS_FOOTER
+            },
+            "color": PROGRESS_HEX,
+            "fields": [
+                {
+                    "name": "Checks Completed",
+                    "value": f"{self.count}/{self.total} checks completed: {percent:.1f}% done.",
+                    "inline": True
+                }
+            ]
+        }
+        return discord.Embed.from_dict(embed_dict)
+
+    async def start(self, send):
+        # send is the coroutine function used for the message, e.g. ctx.send
+        self.shown = self.count
+        self.message = await send(embed=self.embed())
+        self.task = asyncio.ensure_future(self._run())
+        return self
+
+    def update(self, count: int):
+        self.count = count
+        self.changed.set()
+
+    async def _run(self):
+        while True:
+            await self.changed.wait()
+            self.changed.clear()
+            if self.count != self.shown:
+                self.shown = self.count
+                try:
+                    await self.message.edit(embed=self.embed())
+                except discord.HTTPException:
+                    pass
+            await asyncio.sleep(self.interval)
+
+    async def finish(self):
+        if self.task:
+            self.task.cancel()
+        if self.message:
+            try:
+                await self.message.delete()
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,121 @@
+# Imports
+import asyncio
+import time
+from collections import deque
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# Share of the bucket background jobs leave untouched so commands can burst straight through
+INTERACTIVE_RESERVE = 0.2
+DEFAULT_RETRY_AFTER = 10
+
+def header_number(headers, *names):
+    for name in names:
+        value = headers.get(name) if headers else None
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+class TokenBucket:
+    # Request budget for one upstream API key, shared by every caller using that key.
+    # Waiting interactive requests are always granted before background ones.
+    def __init__(self, per_minute: float, capacity=None, reserve=INTERACTIVE_RESERVE):
+        self.reserve_share = reserve
+        self.rate = per_minute / 60
+        self.capacity = capacity or max(1, per_minute / 6)
+        self.reserve = self.reserve_for(self.capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+
+        self.waiters = {INTERACTIVE: deque(), BACKGROUND: deque()}
+        self.dispatcher = None
+
+    def set_rate(self, per_minute: float, capacity=None):
+        # Used when part of the key's budget is handed to another process
+        self._refill()
+        self.rate = per_minute / 60
+        self.capacity = capacity or max(1, per_minute / 6)
+        self.reserve = self.reserve_for(self.capacity)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def reserve_for(self, capacity: float):
+        # Background requests need 1 + reserve tokens, which has to fit in the bucket or they'd never run
+        return min(capacity * self.reserve_share, capacity - 1)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+    def _next_waiter(self):
+        # Interactive first, background only while it leaves the reserve in place
+        for priority in (INTERACTIVE, BACKGROUND):
+            queue = self.waiters[priority]
+            while queue and queue[0].done():
+                queue.popleft()
+            if not queue:
+                continue
+            needed = 1 if priority == INTERACTIVE else 1 + self.reserve
+            return queue, needed
+        return None, None
+
+    async def _dispatch(self):
+        while True:
+            queue, needed = self._next_waiter()
+            if queue is None:
+                break
+            now = self._refill()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            if self.tokens < needed:
+                await asyncio.sleep((needed - self.tokens) / self.rate)
+                continue
+            self.tokens -= 1
+            queue.popleft().set_result(None)
+        self.dispatcher = None
+
+    @property
+    def low(self):
+        # Background callers would have to wait for the budget right now
+        now = self._refill()
+        return now < self.blocked_until or self.tokens < 1 + self.reserve
+
+    async def acquire(self, priority=BACKGROUND):
+        future = asyncio.get_event_loop().create_future()
+        self.waiters[priority].append(future)
+        if self.dispatcher is None or self.dispatcher.done():
+            self.dispatcher = asyncio.ensure_future(self._dispatch())
+        await future
+
+    def update(self, status: int, headers):
+        # Follows the upstream's own view of the budget when it sends one
+        now = self._refill()
+        remaining = header_number(headers, "RateLimit-Remaining", "X-RateLimit-Remaining")
+        reset = header_number(headers, "RateLimit-Reset", "X-RateLimit-Reset")
+        if reset and reset > 1e9:
+            # Some APIs send the reset as an epoch timestamp rather than seconds left
+            reset = max(reset - time.time(), 0)
+        if remaining is not None:
+            self.tokens = min(self.tokens, remaining)
+            if remaining < 1 and reset:
+                self.blocked_until = max(self.blocked_until, now + reset)
+        if status == 429:
+            retry_after = header_number(headers, "Retry-After") or reset or DEFAULT_RETRY_AFTER
+            self.tokens = 0
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+buckets = {}
+
+def bucket_for(key: str, per_minute: float):
+    # One bucket per API key, however many modules call with it
+    if key not in buckets:
+        buckets[key] = TokenBucket(per_minute)
+    return buckets[key]
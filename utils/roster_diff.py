@@ -0,0 +1,55 @@
+# Imports
+import json
+
+class RosterDiff:
+    # Join/leave tracking for any number of guild rosters. Each guild's previous roster is kept as
+    # a set, so a diff costs O(members) per guild. Changes collect in pending until they're announced.
+    def __init__(self):
+        self.previous = {}  # prefix -> set of uuids
+        self.pending = {}   # prefix -> (joined set, left set)
+
+    def seed(self, rosters: dict):
+        # Baseline to compare the first fetched rosters against, guilds already known are kept
+        for prefix, uuids in rosters.items():
+            if prefix not in self.previous:
+                self.previous[prefix] = set(uuids)
+
+    def update(self, rosters: dict):
+        # rosters: prefix -> uuids. Guilds seen for the first time only set their baseline.
+        changed = []
+        for prefix, uuids in rosters.items():
+            current = set(uuids)
+            previous = self.previous.get(prefix)
+            self.previous[prefix] = current
+            if previous is None or previous == current:
+                continue
+
+            joined, left = self.pending.setdefault(prefix, (set(), set()))
+            for uuid in current - previous:
+                # Leaving and rejoining before an announcement cancels out
+                if uuid in left:
+                    left.discard(uuid)
+                else:
+                    joined.add(uuid)
+            for uuid in previous - current:
+                if uuid in joined:
+                    joined.discard(uuid)
+                else:
+                    left.add(uuid)
+            changed.append(prefix)
+        return changed
+
+    def changes(self):
+        # Pending changes per guild, guilds which netted out to nothing are dropped
+        self.pending = {prefix: change for prefix, change in self.pending.items() if change[0] or change[1]}
+        return [(prefix, joined, left) for prefix, (joined, left) in self.pending.items()]
+
+    def clear(self, prefix: str):
+        self.pending.pop(prefix, None)
+
+def parse_alert_channels(raw, default=None):
+    # Config value is JSON mapping a guild prefix to a channel id or a list of them
+    channels = dict(default or {})
+    if raw:
+        channels.update(json.loads(raw))
+    return {prefix: [int(channel) for channel in (ids if isinstance(ids, list) else [ids])] for prefix, ids in channels.items()}
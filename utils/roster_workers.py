@@ -0,0 +1,147 @@
+# Imports
+import asyncio
+import multiprocessing
+import queue
+import time
+import traceback
+import zlib
+
+from utils import http_client
+from utils.rate_limit import TokenBucket
+
+STOP_TIMEOUT = 5
+
+def shard_of(guild: str, shards: int):
+    # Stable across restarts, unlike hash()
+    return zlib.crc32(guild.encode("utf-8")) % shards
+
+def partition(guilds, shards: int):
+    parts = [[] for _ in range(shards)]
+    for guild in guilds:
+        parts[shard_of(guild, shards)].append(guild)
+    return parts
+
+async def fetch_roster(guild: str, url: str, params: dict, limiter, semaphore):
+    # Returns (prefix, names, uuids) as listed by the guild stats endpoint, None when unavailable
+    async with semaphore:
+        request = await http_client.get_json(f"{url}&command={guild}", params=params, limiter=limiter)
+    if request.status != 200 or not request.data or "members" not in request.data:
+        return None
+    members = request.data["members"]
+    return request.data["prefix"], [member["name"] for member in members], [member["uuid"] for member in members]
+
+async def fetch_rosters(guilds, url: str, params: dict, limiter, semaphore, deadline: float):
+    # Rosters of every guild fetched before the deadline, keyed by guild name
+    fetches = {asyncio.ensure_future(fetch_roster(guild, url, params, limiter, semaphore)): guild for guild in guilds}
+    if not fetches:
+        return {}
+    done, pending = await asyncio.wait(fetches, timeout=deadline)
+
+    for task in pending:
+        task.cancel()
+
+    rosters = {}
+    for task in done:
+        if not task.cancelled() and not task.exception() and task.result():
+            rosters[fetches[task]] = task.result()
+    return rosters
+
+async def worker_main(guilds, commands, events, settings):
+    # Each worker has its own HTTP session and its share of the request budget
+    limiter = TokenBucket(settings["per_minute"])
+    semaphore = asyncio.Semaphore(settings["concurrency"])
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            cycle = await loop.run_in_executor(None, commands.get)
+            if cycle is None:
+                break
+            try:
+                rosters = await fetch_rosters(guilds, settings["url"], settings["params"], limiter, semaphore, settings["deadline"])
+            except Exception:
+                traceback.print_exc()
+                rosters = {}
+            events.put((cycle, rosters))
+    finally:
+        await http_client.close()
+
+def run_worker(guilds, commands, events, settings):
+    try:
+        asyncio.run(worker_main(guilds, commands, events, settings))
+    except KeyboardInterrupt:
+        pass
+
+class RosterWorkers:
+    # Tracked guilds split across worker processes by a stable hash of their name. Every refresh asks
+    # each worker for its share, the rosters come back over one queue and are merged by guild name.
+    def __init__(self, count: int, url: str, params: dict, per_minute: float, concurrency: int, deadline: float):
+        # per_minute is the request budget of all workers together
+        self.count = count
+        self.settings = {
+            "url": url,
+            "params": params,
+            "per_minute": per_minute / count,
+            "concurrency": max(1, concurrency // count),
+            "deadline": deadline,
+        }
+        self.context = multiprocessing.get_context("spawn")
+        self.shards = []
+        self.processes = []
+        self.commands = []
+        self.events = None
+        self.cycle = 0
+
+    def start(self, guilds):
+        self.shards = [shard for shard in partition(guilds, self.count) if shard]
+        self.events = self.context.Queue()
+        self.commands = [self.context.Queue() for _ in self.shards]
+        self.processes = [None] * len(self.shards)
+        for shard in range(len(self.shards)):
+            self._spawn(shard)
+
+    def _spawn(self, shard: int):
+        process = self.context.Process(
+            target=run_worker,
+            args=(self.shards[shard], self.commands[shard], self.events, self.settings),
+            name=f"roster-worker-{shard}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[shard] = process
+
+    async def refresh(self, timeout: float):
+        # Guilds of a worker which didn't answer in time are left out, callers keep their last roster
+        loop = asyncio.get_event_loop()
+        self.cycle += 1
+        for shard, process in enumerate(self.processes):
+            if not process.is_alive():
+                print(f"Roster worker {shard} exited with {process.exitcode}, restarting")
+                self._spawn(shard)
+            self.commands[shard].put(self.cycle)
+
+        rosters = {}
+        answered = 0
+        deadline = time.monotonic() + timeout
+        while answered < len(self.processes):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                cycle, shard_rosters = await loop.run_in_executor(None, self.events.get, True, remaining)
+            except queue.Empty:
+                break
+            if cycle != self.cycle:
+                # Late answer to an earlier refresh
+                continue
+            rosters.update(shard_rosters)
+            answered += 1
+        return rosters
+
+    def stop(self):
+        for commands in self.commands:
+            commands.put(None)
+        for process in self.processes:
+            process.join(STOP_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
@@ -0,0 +1,125 @@
+# Imports
+import os
+
+BASEDIR = os.path.abspath(os.path.dirname(__file__))
+LOG_POS = os.path.join(BASEDIR, '../data/sessions.wal')
+
+COMPACT_AFTER = 5000
+
+START = "S"
+END = "E"
+RECORD = "R"
+
+class SessionLog:
+    # Append-only log of session start/end events, replayed into the map of open sessions. The
+    # playtime records of ended sessions are logged too and kept until the history is pushed.
+    def __init__(self, path=LOG_POS, compact_after=COMPACT_AFTER):
+        self.path = path
+        self.compact_after = compact_after
+
+        self.sessions = {}
+        self.records = []   # (hour, record) of ended sessions not yet in the data repository
+        self.entries = 0
+        self.version = 0
+        self.found = False  # whether replay found a log, an empty one just means no open sessions
+        self.file = None
+
+    def replay(self):
+        self.sessions.clear()
+        self.records = []
+        self.entries = 0
+
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            self.found = False
+            return self.sessions
+        self.found = True
+
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) != len(data):
+            # Drops a torn final line left by a crash so new events start on a clean line
+            with open(self.path, "r+b") as file:
+                file.truncate(len(complete))
+
+        for line in complete.decode("utf-8", errors="replace").splitlines():
+            parts = line.split("\t")
+            if len(parts) == 5 and parts[0] == RECORD and parts[1].isdigit() and parts[4].isdigit():
+                _, hour, uuid, guild, duration = parts
+                self.records.append((int(hour), {"uuid": uuid, "duration": int(duration), "guild": guild}))
+                self.entries += 1
+                continue
+            if len(parts) != 3 or not parts[2].isdigit():
+                continue
+            event, player, timestamp = parts
+            if event == START:
+                self.sessions[player] = int(timestamp)
+            elif event == END:
+                self.sessions.pop(player, None)
+            self.entries += 1
+
+        return self.sessions
+
+    def _write(self, line: str):
+        if self.file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.file.write(line)
+        self.entries += 1
+
+    def _append(self, event: str, player: str, timestamp: int):
+        self._write(f"{event}\t{player}\t{int(timestamp)}\n")
+        self.version += 1
+
+    def start(self, player: str, timestamp: int):
+        self.sessions[player] = int(timestamp)
+        self._append(START, player, timestamp)
+
+    def end(self, player: str, timestamp: int):
+        if self.sessions.pop(player, None) is not None:
+            self._append(END, player, timestamp)
+
+    def record(self, hour: int, record: dict):
+        # Made durable with the session's end, so a restart before the next push doesn't lose it
+        self.records.append((hour, record))
+        self._write(f"{RECORD}\t{hour}\t{record['uuid']}\t{record['guild']}\t{int(record['duration'])}\n")
+
+    def settle(self, count: int):
+        # The first count records have been pushed to the data repository
+        if count:
+            del self.records[:count]
+            self.compact()
+
+    def load(self, sessions: dict):
+        # Seeds the log from another source, e.g. the old remote backup
+        for player, timestamp in sessions.items():
+            self.start(player, timestamp)
+        self.sync()
+
+    def sync(self):
+        # Events are buffered during a cycle and made durable once at the end of it
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        if self.entries > max(self.compact_after, 2 * (len(self.sessions) + len(self.records))):
+            self.compact()
+
+    def compact(self):
+        self.close()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for player, timestamp in self.sessions.items():
+                file.write(f"{START}\t{player}\t{timestamp}\n")
+            for hour, record in self.records:
+                file.write(f"{RECORD}\t{hour}\t{record['uuid']}\t{record['guild']}\t{int(record['duration'])}\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        self.entries = len(self.sessions) + len(self.records)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,195 @@
+# Imports
+import io
+import zlib
+from datetime import date, timedelta
+from uuid import UUID
+
+# Layout: MAGIC, version byte, flags byte, then a (optionally deflated) stream of tagged entries.
+# Guild prefixes are interned through TAG_STRING entries, uuids are stored as 16 raw bytes and
+# every integer is an unsigned LEB128 varint. Version 2 stores session durations in seconds,
+# version 1 stored whole minutes and is scaled up when read.
+MAGIC = b"PWS"
+VERSION = 2
+MINUTES_VERSION = 1
+FLAG_COMPRESSED = 0x01
+
+TAG_END = 0
+TAG_STRING = 1
+TAG_HOUR = 2
+TAG_DAY = 3
+
+EPOCH_DAY = date(1970, 1, 1)
+DAY_FORMAT = "%Y-%m-%d"
+CHUNK_SIZE = 64 * 1024
+
+class SnapshotError(Exception):
+    pass
+
+def encode_varint(value: int):
+    if value < 0:
+        raise SnapshotError(f"Cannot encode negative value {value}")
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+def uuid_bytes(uuid: str):
+    return bytes.fromhex(uuid.replace("-", ""))
+
+class SnapshotWriter:
+    def __init__(self, stream, compress=True, level=6):
+        self.stream = stream
+        self.compressor = zlib.compressobj(level) if compress else None
+        self.strings = {}
+
+        stream.write(MAGIC + bytes([VERSION, FLAG_COMPRESSED if compress else 0]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _emit(self, data: bytes):
+        if self.compressor:
+            data = self.compressor.compress(data)
+        self.stream.write(data)
+
+    def _string(self, value: str):
+        if value not in self.strings:
+            encoded = value.encode("utf-8")
+            self._emit(bytes([TAG_STRING]) + encode_varint(len(encoded)) + encoded)
+            self.strings[value] = len(self.strings)
+        return self.strings[value]
+
+    def write_hour(self, hour: int, records: list):
+        # Session records for one epoch hour: uuid, guild and duration each
+        indexes = [self._string(record["guild"]) for record in records]
+        out = bytearray([TAG_HOUR])
+        out += encode_varint(hour)
+        out += encode_varint(len(records))
+        for record, index in zip(records, indexes):
+            out += uuid_bytes(record["uuid"])
+            out += encode_varint(index)
+            out += encode_varint(record["duration"])
+        self._emit(bytes(out))
+
+    def write_day(self, day: str, rosters: dict):
+        # Guild rosters for one ISO day
+        indexes = {guild: self._string(guild) for guild in rosters}
+        day_number = (date.fromisoformat(day) - EPOCH_DAY).days
+        out = bytearray([TAG_DAY])
+        out += encode_varint(day_number)
+        out += encode_varint(len(rosters))
+        for guild, uuids in rosters.items():
+            out += encode_varint(indexes[guild])
+            out += encode_varint(len(uuids))
+            for uuid in uuids:
+                out += uuid_bytes(uuid)
+        self._emit(bytes(out))
+
+    def close(self):
+        self._emit(bytes([TAG_END]))
+        if self.compressor:
+            self.stream.write(self.compressor.flush())
+            self.compressor = None
+
+class SnapshotReader:
+    # Iterates ("hour", hour, records) and ("day", day, rosters) entries without loading the whole body
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = b""
+        self.position = 0
+        self.strings = []
+
+        header = stream.read(len(MAGIC) + 2)
+        if len(header) < len(MAGIC) + 2 or header[:len(MAGIC)] != MAGIC:
+            raise SnapshotError("Not a snapshot stream")
+        if header[len(MAGIC)] > VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {header[len(MAGIC)]}")
+        self.decompressor = zlib.decompressobj() if header[len(MAGIC) + 1] & FLAG_COMPRESSED else None
+        self.duration_scale = 60 if header[len(MAGIC)] <= MINUTES_VERSION else 1
+
+    def _fill(self, size: int):
+        while len(self.buffer) - self.position < size:
+            raw = self.stream.read(self.chunk_size)
+            if self.decompressor:
+                chunk = self.decompressor.decompress(raw) if raw else self.decompressor.flush()
+            else:
+                chunk = raw
+            if not raw and not chunk:
+                raise SnapshotError("Snapshot ended unexpectedly")
+            self.buffer = self.buffer[self.position:] + chunk
+            self.position = 0
+
+    def _read(self, size: int):
+        self._fill(size)
+        data = self.buffer[self.position:self.position + size]
+        self.position += size
+        return data
+
+    def _check_end(self):
+        # A deflated stream cut short can still hold every entry, its missing checksum gives it away
+        if not self.decompressor:
+            return
+        while not self.decompressor.eof:
+            raw = self.stream.read(self.chunk_size)
+            if not raw:
+                raise SnapshotError("Snapshot ended unexpectedly")
+            self.decompressor.decompress(raw)
+
+    def _varint(self):
+        value = 0
+        shift = 0
+        while True:
+            byte = self._read(1)[0]
+            value |= (byte & 0x7f) << shift
+            if not byte & 0x80:
+                return value
+            shift += 7
+
+    def __iter__(self):
+        while True:
+            tag = self._read(1)[0]
+            if tag == TAG_END:
+                self._check_end()
+                return
+            if tag == TAG_STRING:
+                self.strings.append(self._read(self._varint()).decode("utf-8"))
+            elif tag == TAG_HOUR:
+                hour = self._varint()
+                records = []
+                for _ in range(self._varint()):
+                    uuid = self._read(16).hex()
+                    guild = self.strings[self._varint()]
+                    records.append({"uuid": uuid, "duration": self._varint() * self.duration_scale, "guild": guild})
+                yield ("hour", hour, records)
+            elif tag == TAG_DAY:
+                day = (EPOCH_DAY + timedelta(days=self._varint())).strftime(DAY_FORMAT)
+                rosters = {}
+                for _ in range(self._varint()):
+                    guild = self.strings[self._varint()]
+                    # Roster uuids keep the dashed form the Wynncraft API returns
+                    rosters[guild] = [str(UUID(bytes=self._read(16))) for _ in range(self._varint())]
+                yield ("day", day, rosters)
+            else:
+                raise SnapshotError(f"Unknown snapshot entry {tag}")
+
+def dumps(hours=(), days=(), compress=True):
+    # hours: iterable of (hour, records), days: iterable of (day, rosters)
+    stream = io.BytesIO()
+    with SnapshotWriter(stream, compress=compress) as writer:
+        for hour, records in hours:
+            writer.write_hour(hour, records)
+        for day, rosters in days:
+            writer.write_day(day, rosters)
+    return stream.getvalue()
+
+def loads(data: bytes):
+    return list(SnapshotReader(io.BytesIO(data)))
@@ -0,0 +1,141 @@
+# Imports
+import csv
+import io
+import sqlite3
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+
+PLAYTIME_TABLE = "playtime_sessions"
+MEMBERS_TABLE = "guild_members"
+PLAYTIME_COLUMNS = ("timestamp", "guild", "uuid", "duration")
+MEMBERS_COLUMNS = ("timestamp", "guild", "uuid")
+
+# Rows per INSERT statement, kept under SQLite's default limit of 999 bound parameters
+BATCH_SIZE = 200
+MAX_PENDING = 200000
+RETRY_DELAY = 30
+MAX_RETRY_DELAY = 900
+
+SCHEMA = (
+    f"CREATE TABLE IF NOT EXISTS {PLAYTIME_TABLE} (timestamp BIGINT NOT NULL, guild TEXT NOT NULL, uuid TEXT NOT NULL, duration INTEGER NOT NULL)",
+    f"CREATE TABLE IF NOT EXISTS {MEMBERS_TABLE} (timestamp BIGINT NOT NULL, guild TEXT NOT NULL, uuid TEXT NOT NULL)",
+)
+
+@contextmanager
+def sqlite_cursor(path: str):
+    # Local stand-in for the hosted database, commits when the block exits cleanly
+    connection = sqlite3.connect(path)
+    try:
+        yield connection.cursor()
+        connection.commit()
+    finally:
+        connection.close()
+
+def insert_statement(table: str, columns: tuple, rows: int, placeholder: str):
+    row = f"({', '.join([placeholder] * len(columns))})"
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row] * rows)}"
+
+class SqlSink:
+    # Buffers normalized rows and writes them with parameterized multi-row inserts.
+    # cursor_factory returns a context manager yielding a DB-API cursor, e.g. bitio.pooled_cursor
+    # for Postgres ("%s" placeholders) or sqlite_cursor for local runs ("?" placeholders).
+    def __init__(self, cursor_factory, placeholder="%s", batch_size=BATCH_SIZE, max_pending=MAX_PENDING):
+        self.cursor_factory = cursor_factory
+        self.placeholder = placeholder
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+
+        self.pending = {PLAYTIME_TABLE: deque(), MEMBERS_TABLE: deque()}
+        self.lock = threading.Lock()
+        self.schema_ready = False
+        self.failures = 0
+        self.retry_at = 0
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.pending.values())
+
+    def _queue(self, table: str, rows: list):
+        with self.lock:
+            queue = self.pending[table]
+            queue.extend(rows)
+            # An outage long enough to fill the buffer drops the oldest rows rather than growing forever
+            overflow = len(queue) - self.max_pending
+            for _ in range(max(overflow, 0)):
+                queue.popleft()
+        if overflow > 0:
+            print(f"SQL sink dropped {overflow} {table} rows while the database was unavailable")
+
+    def add_playtime(self, timestamp: int, records: list):
+        # records: {"uuid", "guild", "duration"} dicts as kept by the playtime store
+        self._queue(PLAYTIME_TABLE, [
+            (int(timestamp), record["guild"], record["uuid"].replace("-", ""), int(record["duration"]))
+            for record in records
+        ])
+
+    def add_members(self, timestamp: int, rosters: dict):
+        # rosters: {guild prefix: [uuids]}
+        self._queue(MEMBERS_TABLE, [
+            (int(timestamp), guild, uuid.replace("-", ""))
+            for guild, uuids in rosters.items() for uuid in uuids
+        ])
+
+    def due(self):
+        return len(self) > 0 and time.time() >= self.retry_at
+
+    def _insert(self, cursor, table: str, columns: tuple, rows: list):
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            statement = insert_statement(table, columns, len(batch), self.placeholder)
+            cursor.execute(statement, [value for row in batch for value in row])
+
+    def flush(self):
+        # Blocking, meant to run in an executor. Returns the number of rows written.
+        if not self.due():
+            return 0
+
+        with self.lock:
+            playtime_rows = list(self.pending[PLAYTIME_TABLE])
+            members_rows = list(self.pending[MEMBERS_TABLE])
+            self.pending[PLAYTIME_TABLE].clear()
+            self.pending[MEMBERS_TABLE].clear()
+
+        try:
+            with self.cursor_factory() as cursor:
+                if not self.schema_ready:
+                    for statement in SCHEMA:
+                        cursor.execute(statement)
+                self._insert(cursor, PLAYTIME_TABLE, PLAYTIME_COLUMNS, playtime_rows)
+                self._insert(cursor, MEMBERS_TABLE, MEMBERS_COLUMNS, members_rows)
+        except Exception:
+            traceback.print_exc()
+            # Nothing was committed, so the rows go back in front of anything queued meanwhile
+            with self.lock:
+                self.pending[PLAYTIME_TABLE].extendleft(reversed(playtime_rows))
+                self.pending[MEMBERS_TABLE].extendleft(reversed(members_rows))
+            self.failures += 1
+            self.retry_at = time.time() + min(RETRY_DELAY * 2 ** (self.failures - 1), MAX_RETRY_DELAY)
+            return 0
+
+        self.schema_ready = True
+        self.failures = 0
+        self.retry_at = 0
+        return len(playtime_rows) + len(members_rows)
+
+    def backfill(self, table: str, rows: list):
+        # Bulk load for history imports, COPY on Postgres and batched inserts elsewhere
+        columns = PLAYTIME_COLUMNS if table == PLAYTIME_TABLE else MEMBERS_COLUMNS
+        with self.cursor_factory() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+            if hasattr(cursor, "copy_expert"):
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+            else:
+                self._insert(cursor, table, columns, rows)
+        self.schema_ready = True
+        return len(rows)
@@ -0,0 +1,108 @@
+# Imports
+import json
+import os
+
+from utils import snapshot
+from utils.playtime_store import PlaytimeStore
+
+BASEDIR = os.path.abspath(os.path.dirname(__file__))
+STATE_POS = os.path.join(BASEDIR, '../data/tracker_state.pws')
+EVENTS_POS = os.path.join(BASEDIR, '../data/tracker_events.log')
+OFFSET_POS = os.path.join(BASEDIR, '../data/tracker_events.offset')
+
+def write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+def modified_at(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def save_state(hours, path=STATE_POS):
+    # hours: (hour, records) pairs copied off the live store, encoding runs outside the event loop
+    write_atomic(path, snapshot.dumps(hours=hours))
+
+def load_state(path=STATE_POS):
+    # Raises FileNotFoundError until the tracker has published its first state
+    with open(path, "rb") as file:
+        data = file.read()
+    store = PlaytimeStore()
+    for _, hour, records in snapshot.loads(data):
+        for record in records:
+            store.add(hour, record)
+    store.clear_dirty()
+    return store
+
+class EventWriter:
+    # Tracker side of the event log, one JSON object per line
+    def __init__(self, path=EVENTS_POS):
+        self.path = path
+        self.file = None
+
+    def append(self, event: dict):
+        if self.file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.file.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def sync(self):
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class EventReader:
+    # Bot side of the event log. The read position is stored next to the log, so events written
+    # while the bot was down are picked up once it is back.
+    def __init__(self, path=EVENTS_POS, offset_path=OFFSET_POS):
+        self.path = path
+        self.offset_path = offset_path
+        self.offset = None
+
+    def _load_offset(self):
+        try:
+            with open(self.offset_path, "r", encoding="utf-8") as file:
+                return int(file.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def read(self):
+        # Returns (new events, offset to commit once they are handled)
+        if self.offset is None:
+            self.offset = self._load_offset()
+        try:
+            with open(self.path, "rb") as file:
+                file.seek(0, os.SEEK_END)
+                if file.tell() < self.offset:
+                    # Log was replaced, start from its beginning
+                    self.offset = 0
+                file.seek(self.offset)
+                data = file.read()
+        except FileNotFoundError:
+            return [], self.offset
+
+        # A line still being written is left for the next read
+        complete = data[:data.rfind(b"\n") + 1]
+        events = []
+        for line in complete.decode("utf-8", errors="replace").splitlines():
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events, self.offset + len(complete)
+
+    def commit(self, offset: int):
+        # Called once the events up to offset have been handled
+        self.offset = offset
+        write_atomic(self.offset_path, str(offset).encode("utf-8"))
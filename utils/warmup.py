@@ -0,0 +1,69 @@
+# Imports
+import asyncio
+import traceback
+
+import discord
+
+READY_TIMEOUT = 5
+RETRY_DELAY = 5
+MAX_RETRY_DELAY = 300
+LOADING_HEX = 0xf5c242
+
+class Warmup:
+    # Loads a cog's state in a background task so extension loading never waits on the network
+    def __init__(self, name: str):
+        self.name = name
+        self.event = asyncio.Event()
+        self.task = None
+
+    @property
+    def ready(self):
+        return self.event.is_set()
+
+    def start(self, loader):
+        # loader is a coroutine function, retried with backoff until it succeeds
+        self.task = asyncio.ensure_future(self._run(loader))
+        return self.task
+
+    async def _run(self, loader):
+        delay = RETRY_DELAY
+        while True:
+            try:
+                await loader()
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                traceback.print_exc()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+        self.event.set()
+
+    async def wait(self, timeout=READY_TIMEOUT):
+        if self.ready:
+            return True
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def cancel(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+def not_ready_embed(requester: str, title: str):
+    embed_dict = {
+        "title": title,
+        "footer": {
+            "text": requester
+        },
+        "color": LOADING_HEX,
+        "fields": [
+            {
+                "name": "Still Starting Up",
+                "value": "The data for this command is still loading after a restart, please try again in a moment."
+            }
+        ]
+    }
+    return discord.Embed.from_dict(embed_dict)